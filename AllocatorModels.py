@@ -0,0 +1,185 @@
+import time
+
+import numpy as np
+
+from AllocatorStats import PoolStats
+from HeapTrace import MALLOC
+
+# Allocator models for comparing strategies on the same trace. Addresses are byte offsets into
+# the model's own arena; allocate() returns None when the request cannot be served.
+
+
+class FixedBlockPools:
+    # XAllocator: one pool of equally sized blocks per size class, each with a LIFO free list
+
+    def __init__(self, block_sizes, blocks_per_pool):
+        self.block_sizes = np.asarray(block_sizes, dtype=np.int64)
+        self.blocks_per_pool = np.broadcast_to(np.asarray(blocks_per_pool, dtype=np.int64),
+                                               self.block_sizes.shape).copy()
+        self.bases = np.concatenate([[0], np.cumsum(self.block_sizes * self.blocks_per_pool)[:-1]])
+        self.total_size = int(np.sum(self.block_sizes * self.blocks_per_pool))
+        self.free_lists = [list(range(count - 1, -1, -1)) for count in self.blocks_per_pool]
+        self.requested = {}
+        self.stats = PoolStats(self.block_sizes, self.blocks_per_pool)
+
+    @property
+    def failed(self):
+        return sum(self.stats.failed)
+
+    def allocate(self, size):
+        pools = np.flatnonzero(self.block_sizes >= size)
+        for pool in pools:
+            if self.free_lists[pool]:
+                address = int(self.bases[pool] + self.free_lists[pool].pop() * self.block_sizes[pool])
+                self.requested[address] = size
+                self.stats.record_allocation(pool, size)
+                return address
+        # Counted at the pool the request was meant for
+        self.stats.record_failure(pools[0] if len(pools) else len(self.block_sizes) - 1)
+        return None
+
+    def free(self, address):
+        pool = int(np.searchsorted(self.bases, address, side="right")) - 1
+        self.free_lists[pool].append(int((address - self.bases[pool]) // self.block_sizes[pool]))
+        self.stats.record_free(pool, self.requested.pop(address))
+
+    def block_size(self, address):
+        return int(self.block_sizes[int(np.searchsorted(self.bases, address, side="right")) - 1])
+
+    def largest_free_block(self):
+        free = [size for size, free_list in zip(self.block_sizes, self.free_lists) if free_list]
+        return int(max(free, default=0))
+
+    def blocks(self):
+        # (row, start, width, requested) per block; start and width as fractions of the row
+        for pool, count in enumerate(self.blocks_per_pool):
+            for index in range(count):
+                address = int(self.bases[pool] + index * self.block_sizes[pool])
+                requested = self.requested.get(address)
+                fraction = None if requested is None else requested / self.block_sizes[pool]
+                yield pool, index / count, 1. / count, fraction
+
+
+class BuddyAllocator:
+    # Blocks of min_block << order bytes. Each order keeps a free list of block offsets and a
+    # bitmap of which blocks of that order are free, so finding a buddy is O(1) and a split or a
+    # coalesce walks at most the O(log n) orders.
+
+    def __init__(self, total_size, min_block, max_block):
+        self.min_block = min_block
+        self.max_order = int(np.log2(max_block // min_block))
+        self.total_size = total_size - total_size % max_block
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.bitmaps = [np.zeros(self.total_size // (min_block << order), dtype=bool)
+                        for order in range(self.max_order + 1)]
+        for offset in range(0, self.total_size, max_block):
+            self.push(offset, self.max_order)
+        self.orders = {}
+        self.requested = {}
+        # One "pool" per order
+        self.stats = PoolStats([min_block << order for order in range(self.max_order + 1)])
+
+    @property
+    def failed(self):
+        return sum(self.stats.failed)
+
+    def push(self, offset, order):
+        self.free_lists[order].add(offset)
+        self.bitmaps[order][offset // (self.min_block << order)] = True
+
+    def take(self, offset, order):
+        self.free_lists[order].remove(offset)
+        self.bitmaps[order][offset // (self.min_block << order)] = False
+
+    def order_for(self, size):
+        # malloc(0) still takes a smallest block
+        return (max(1, -(-size // self.min_block)) - 1).bit_length()
+
+    def allocate(self, size):
+        order = self.order_for(size)
+        available = [k for k in range(order, self.max_order + 1) if self.free_lists[k]]
+        if not available:
+            self.stats.record_failure(min(order, self.max_order))
+            return None
+        k = available[0]
+        offset = self.free_lists[k].pop()
+        self.bitmaps[k][offset // (self.min_block << k)] = False
+        while k > order:  # split, keeping the lower half
+            k -= 1
+            self.push(offset + (self.min_block << k), k)
+        self.orders[offset] = order
+        self.requested[offset] = size
+        self.stats.record_allocation(order, size)
+        return offset
+
+    def free(self, address):
+        order = self.orders.pop(address)
+        self.stats.record_free(order, self.requested.pop(address))
+        while order < self.max_order:  # coalesce while the buddy is free as a whole
+            buddy = address ^ (self.min_block << order)
+            if not self.bitmaps[order][buddy // (self.min_block << order)]:
+                break
+            self.take(buddy, order)
+            address = min(address, buddy)
+            order += 1
+        self.push(address, order)
+
+    def block_size(self, address):
+        return self.min_block << self.orders[address]
+
+    def largest_free_block(self):
+        free = [order for order in range(self.max_order + 1) if self.free_lists[order]]
+        return self.min_block << max(free) if free else 0
+
+    def blocks(self):
+        # Every top level block is one row, its used and free blocks laid out by offset
+        row_size = self.min_block << self.max_order
+        for order, free_list in enumerate(self.free_lists):
+            for offset in free_list:
+                yield offset // row_size, offset % row_size / row_size, (self.min_block << order) / row_size, None
+        for offset, order in self.orders.items():
+            size = self.min_block << order
+            yield offset // row_size, offset % row_size / row_size, size / row_size, self.requested[offset] / size
+
+
+def statistics(model, operations=0, seconds=0.):
+    allocated = sum(model.block_size(address) for address in model.requested)
+    requested = sum(model.requested.values())
+    free = model.total_size - allocated
+    return dict(
+        live_allocations=len(model.requested),
+        requested_bytes=requested,
+        allocated_bytes=allocated,
+        internal_fragmentation=1 - requested / allocated if allocated else 0.,
+        external_fragmentation=1 - model.largest_free_block() / free if free else 0.,
+        failed_allocations=model.failed,
+        operations_per_second=operations / seconds if seconds > 0 else 0.,
+        pools=model.stats.snapshot(),
+    )
+
+
+def replay(model, trace):
+    # Runs a whole trace; frees of allocations the model could not serve are skipped
+    addresses = {}
+    start = time.perf_counter()
+    for op, size, ptr in zip(trace["op"].tolist(), trace["size"].tolist(), trace["ptr"].tolist()):
+        if op == MALLOC:
+            address = model.allocate(size)
+            if address is not None:
+                addresses[ptr] = address
+        elif ptr in addresses:
+            model.free(addresses.pop(ptr))
+    return statistics(model, len(trace), time.perf_counter() - start)
+
+
+def replay_steps(model, trace):
+    # Same as replay(), one event at a time, for animating the model while it runs
+    addresses = {}
+    for op, size, ptr in zip(trace["op"].tolist(), trace["size"].tolist(), trace["ptr"].tolist()):
+        if op == MALLOC:
+            address = model.allocate(size)
+            if address is not None:
+                addresses[ptr] = address
+        elif ptr in addresses:
+            model.free(addresses.pop(ptr))
+        yield op, size
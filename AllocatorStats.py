@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+
+# Counters in the spirit of xalloc_stats(), one entry per pool. The counters are plain lists
+# allocated once, so recording an event only bumps a few Python ints; bumping NumPy elements
+# costs about 20 times as much.
+
+COUNTERS = ("in_use", "high_water", "allocations", "frees", "failed", "slack_bytes")
+
+
+class PoolStats:
+
+    def __init__(self, block_sizes, block_counts=None):
+        self.block_sizes = np.asarray(block_sizes, dtype=np.int64)
+        self.block_counts = None if block_counts is None else np.asarray(block_counts, dtype=np.int64)
+        self.sizes = self.block_sizes.tolist()
+        for name in COUNTERS:
+            setattr(self, name, [0] * len(self.sizes))
+        # Bumped on every event, so views can tell whether anything changed
+        self.version = 0
+
+    def record_allocation(self, pool, requested):
+        self.in_use[pool] += 1
+        self.allocations[pool] += 1
+        self.slack_bytes[pool] += self.sizes[pool] - requested
+        if self.in_use[pool] > self.high_water[pool]:
+            self.high_water[pool] = self.in_use[pool]
+        self.version += 1
+
+    def record_free(self, pool, requested):
+        self.in_use[pool] -= 1
+        self.frees[pool] += 1
+        self.slack_bytes[pool] -= self.sizes[pool] - requested
+        self.version += 1
+
+    def record_failure(self, pool):
+        self.failed[pool] += 1
+        self.version += 1
+
+    def snapshot(self):
+        snapshot = {name: list(getattr(self, name)) for name in COUNTERS}
+        snapshot["block_size"] = list(self.sizes)
+        if self.block_counts is not None:
+            snapshot["block_count"] = self.block_counts.tolist()
+        return snapshot
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    def format(self):
+        # One line per pool, like xalloc_stats() prints them
+        lines = []
+        for pool, size in enumerate(self.sizes):
+            lines.append(f"Allocator {size:>5}: in use {self.in_use[pool]}, high water {self.high_water[pool]}, "
+                         f"allocations {self.allocations[pool]}, frees {self.frees[pool]}, "
+                         f"failed {self.failed[pool]}, slack {self.slack_bytes[pool]} B")
+        return "\n".join(lines)
@@ -0,0 +1,226 @@
+import numpy as np
+
+# Closed outlines made of circular arcs and line segments, with a closed form union. A piece is
+# ("arc", center, radius, start_angle, end_angle) or ("line", start, end), all points 2D; an
+# outline is a counter clockwise loop of pieces plus a point membership test.
+
+TOLERANCE = 1e-9
+
+
+def direction(angle):
+    return np.array([np.cos(angle), np.sin(angle)])
+
+
+class Outline:
+
+    def __init__(self, loops, contains):
+        self.loops = loops
+        self.contains = contains
+
+    @property
+    def pieces(self):
+        return [piece for loop in self.loops for piece in loop]
+
+    def transformed(self, point_map, angle_map, reverse):
+        loops = []
+        for loop in self.loops:
+            pieces = [transform_piece(piece, point_map, angle_map, reverse) for piece in loop]
+            loops.append(pieces[::-1] if reverse else pieces)
+        return loops
+
+    def shift(self, offset):
+        offset = np.asarray(offset, dtype=float)
+        return Outline(self.transformed(lambda p: p + offset, lambda a: a, False),
+                       lambda points: self.contains(points - offset))
+
+    def mirror_x(self, axis_x):
+        # Mirroring flips the orientation, the loops are reversed to stay counter clockwise
+        def mirror(points):
+            points = np.array(points, dtype=float)
+            points[..., 0] = 2 * axis_x - points[..., 0]
+            return points
+        return Outline(self.transformed(mirror, lambda a: np.pi - a, True),
+                       lambda points: self.contains(mirror(points)))
+
+    def union(self, other):
+        pieces = outside_pieces(self.pieces, other.pieces, other.contains) + \
+                 outside_pieces(other.pieces, self.pieces, self.contains)
+        return Outline(chain(pieces), lambda points: self.contains(points) | other.contains(points))
+
+    def bezier_points(self):
+        return np.concatenate([piece_bezier_points(piece) for piece in self.pieces])
+
+
+def transform_piece(piece, point_map, angle_map, reverse):
+    if piece[0] == "line":
+        start, end = point_map(piece[1]), point_map(piece[2])
+        return ("line", end, start) if reverse else ("line", start, end)
+    _, center, radius, start, end = piece
+    if reverse:
+        start, end = end, start
+    return "arc", point_map(center), radius, angle_map(start), angle_map(end)
+
+
+def circle(center, radius):
+    center = np.asarray(center, dtype=float)
+    return Outline([[("arc", center, radius, 0., 2 * np.pi)]],
+                   lambda points: np.linalg.norm(points - center, axis=-1) < radius - TOLERANCE)
+
+
+def half_disc(center, radius, angle):
+    # The half of the disc facing away from direction(angle): an arc plus its flat edge
+    center = np.asarray(center, dtype=float)
+    normal = direction(angle)
+    start, end = angle + np.pi / 2, angle + 3 * np.pi / 2
+    arc = ("arc", center, radius, start, end)
+    edge = ("line", center + radius * direction(end), center + radius * direction(start))
+
+    def contains(points):
+        offset = points - center
+        return (np.linalg.norm(offset, axis=-1) < radius - TOLERANCE) & (offset @ normal < -TOLERANCE)
+    return Outline([[arc, edge]], contains)
+
+
+def point_at(piece, t):
+    t = np.asarray(t, dtype=float)
+    if piece[0] == "line":
+        return piece[1] + t[..., None] * (piece[2] - piece[1])
+    _, center, radius, start, end = piece
+    angles = start + t * (end - start)
+    return center + radius * np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+
+
+def arc_parameter(piece, points):
+    # Parameter of points that lie on the arc's circle, nan where they are outside its sweep
+    _, center, radius, start, end = piece
+    sweep = end - start
+    angles = np.arctan2(points[..., 1] - center[1], points[..., 0] - center[0])
+    turned = np.mod((angles - start) * np.sign(sweep), 2 * np.pi)
+    # Points a rounding error before the start angle wrap around to almost a full turn
+    t = np.where(turned > 2 * np.pi - 1e-9, 0., turned) / abs(sweep)
+    return np.where(t <= 1 + TOLERANCE, t, np.nan)
+
+
+def piece_parameter(piece, points):
+    if piece[0] == "arc":
+        return arc_parameter(piece, points)
+    start, end = piece[1], piece[2]
+    delta = end - start
+    t = (points - start) @ delta / (delta @ delta)
+    return np.where((t >= -TOLERANCE) & (t <= 1 + TOLERANCE), t, np.nan)
+
+
+def line_circle_points(start, end, center, radius):
+    delta = end - start
+    offset = start - center
+    a, b, c = delta @ delta, 2 * offset @ delta, offset @ offset - radius ** 2
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return np.empty((0, 2))
+    roots = (-b + np.array([-1, 1]) * np.sqrt(discriminant)) / (2 * a)
+    return start + roots[:, None] * delta
+
+
+def circle_circle_points(center_a, radius_a, center_b, radius_b):
+    delta = center_b - center_a
+    distance = np.linalg.norm(delta)
+    if distance < TOLERANCE or distance > radius_a + radius_b or distance < abs(radius_a - radius_b):
+        return np.empty((0, 2))
+    along = (radius_a ** 2 - radius_b ** 2 + distance ** 2) / (2 * distance)
+    height = np.sqrt(max(radius_a ** 2 - along ** 2, 0.))
+    base = center_a + along * delta / distance
+    normal = np.array([-delta[1], delta[0]]) / distance
+    return np.array([base + height * normal, base - height * normal])
+
+
+def line_line_points(piece_a, piece_b):
+    da, db = piece_a[2] - piece_a[1], piece_b[2] - piece_b[1]
+    denominator = da[0] * db[1] - da[1] * db[0]
+    if abs(denominator) < TOLERANCE:
+        return np.empty((0, 2))
+    offset = piece_b[1] - piece_a[1]
+    t = (offset[0] * db[1] - offset[1] * db[0]) / denominator
+    return (piece_a[1] + t * da)[None]
+
+
+def intersection_points(piece_a, piece_b):
+    kinds = piece_a[0], piece_b[0]
+    if kinds == ("line", "line"):
+        points = line_line_points(piece_a, piece_b)
+    elif kinds == ("arc", "arc"):
+        points = circle_circle_points(piece_a[1], piece_a[2], piece_b[1], piece_b[2])
+    elif kinds == ("line", "arc"):
+        points = line_circle_points(piece_a[1], piece_a[2], piece_b[1], piece_b[2])
+    else:
+        points = line_circle_points(piece_b[1], piece_b[2], piece_a[1], piece_a[2])
+    # Only points on both pieces, not just on their circles or lines
+    on_both = ~np.isnan(piece_parameter(piece_a, points)) & ~np.isnan(piece_parameter(piece_b, points))
+    return points[on_both]
+
+
+def split_piece(piece, parameters):
+    parameters = np.unique(np.clip(parameters, 0, 1))
+    parameters = parameters[(parameters > TOLERANCE) & (parameters < 1 - TOLERANCE)]
+    bounds = np.concatenate([[0.], parameters, [1.]])
+    if piece[0] == "line":
+        points = point_at(piece, bounds)
+        return [("line", points[i], points[i + 1]) for i in range(len(bounds) - 1)]
+    _, center, radius, start, end = piece
+    angles = start + bounds * (end - start)
+    return [("arc", center, radius, angles[i], angles[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def outside_pieces(pieces, others, other_contains):
+    kept = []
+    for piece in pieces:
+        points = [intersection_points(piece, other) for other in others]
+        points = np.concatenate(points) if points else np.empty((0, 2))
+        for part in split_piece(piece, piece_parameter(piece, points)):
+            if not other_contains(point_at(part, 0.5)):
+                kept.append(part)
+    return kept
+
+
+def start_point(piece):
+    return point_at(piece, 0.)
+
+
+def end_point(piece):
+    return point_at(piece, 1.)
+
+
+def chain(pieces, tolerance=1e-6):
+    # Link pieces end to start into closed loops
+    loops = []
+    remaining = list(pieces)
+    while remaining:
+        loop = [remaining.pop(0)]
+        while remaining:
+            end = end_point(loop[-1])
+            distances = [np.linalg.norm(start_point(piece) - end) for piece in remaining]
+            closest = int(np.argmin(distances))
+            if distances[closest] > tolerance or np.linalg.norm(start_point(loop[0]) - end) < tolerance:
+                break
+            loop.append(remaining.pop(closest))
+        loops.append(loop)
+    return loops
+
+
+def piece_bezier_points(piece):
+    # Cubic bezier curves as manim stores them: (anchor, handle, handle, anchor) per curve, 3D
+    if piece[0] == "line":
+        start, end = piece[1], piece[2]
+        points = np.array([start, start + (end - start) / 3., start + 2 * (end - start) / 3., end])
+    else:
+        _, center, radius, start, end = piece
+        count = max(1, int(np.ceil(abs(end - start) / (np.pi / 4))))
+        angles = np.linspace(start, end, count + 1)
+        step = (end - start) / count
+        handle = 4 / 3. * np.tan(step / 4) * radius
+        a0, a1 = angles[:-1], angles[1:]
+        p0 = center + radius * np.stack([np.cos(a0), np.sin(a0)], axis=-1)
+        p3 = center + radius * np.stack([np.cos(a1), np.sin(a1)], axis=-1)
+        p1 = p0 + handle * np.stack([-np.sin(a0), np.cos(a0)], axis=-1)
+        p2 = p3 - handle * np.stack([-np.sin(a1), np.cos(a1)], axis=-1)
+        points = np.stack([p0, p1, p2, p3], axis=1).reshape(-1, 2)
+    return np.column_stack([points, np.zeros(len(points))])
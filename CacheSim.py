@@ -0,0 +1,108 @@
+import numpy as np
+
+# Set associative LRU cache. Accesses to different sets never interact, so a stream is sorted by
+# set and every set advances in lockstep: step r handles the r-th access of all sets at once.
+# The number of numpy steps is the largest per set count, not the stream length. A stream that
+# falls into few sets (page strided addresses, one hot line) needs about one step per access,
+# and a numpy step costs far more than a Python one, so such streams are run access by access.
+
+HIT_CYCLES = 4
+MISS_CYCLES = 200
+# Run access by access once the busiest set holds more than this fraction of the stream
+SEQUENTIAL_FRACTION = 1 / 32
+
+
+class Cache:
+
+    def __init__(self, line_size=64, sets=64, ways=8):
+        self.line_size = line_size
+        self.sets = sets
+        self.ways = ways
+        self.tags = np.full((sets, ways), -1, dtype=np.int64)
+        # Time of the last use per way, -1 for ways that were never filled so they are chosen first
+        self.last_used = np.full((sets, ways), -1, dtype=np.int64)
+        self.clock = 0
+        self.accesses = 0
+        self.hits = 0
+
+    def size(self):
+        return self.line_size * self.sets * self.ways
+
+    def config(self):
+        return dict(line_size=self.line_size, sets=self.sets, ways=self.ways)
+
+    def run(self, addresses, sequential=None):
+        # Hit mask of the accesses; the cache stays warm for the next call. `sequential` forces
+        # one of the two implementations, by default the one with fewer steps is picked.
+        lines = np.asarray(addresses, dtype=np.int64) // self.line_size
+        set_index, tags = lines % self.sets, lines // self.sets
+        counts = np.bincount(set_index, minlength=self.sets)
+        if sequential is None:
+            sequential = len(lines) > 0 and counts.max() > len(lines) * SEQUENTIAL_FRACTION
+        if sequential:
+            hits = self.run_sequential(set_index, tags)
+        else:
+            hits = self.run_lockstep(set_index, tags, counts)
+        self.clock += len(lines)
+        self.accesses += len(lines)
+        self.hits += int(np.count_nonzero(hits))
+        return hits
+
+    def run_lockstep(self, set_index, tags, counts):
+        hits = np.zeros(len(set_index), dtype=bool)
+        if len(set_index) == 0:
+            return hits
+        order = np.argsort(set_index, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        # Busiest sets first, then the sets active at step r are a prefix
+        by_count = np.argsort(-counts, kind="stable")
+        sorted_counts = counts[by_count]
+        for rank in range(int(sorted_counts[0])):
+            active = int(np.searchsorted(-sorted_counts, -rank, side="left"))
+            sets = by_count[:active]
+            positions = order[starts[sets] + rank]
+            tag = tags[positions]
+            match = self.tags[sets] == tag[:, None]
+            hit = match.any(axis=1)
+            way = np.where(hit, match.argmax(axis=1), self.last_used[sets].argmin(axis=1))
+            self.tags[sets, way] = tag
+            self.last_used[sets, way] = self.clock + positions
+            hits[positions] = hit
+        return hits
+
+    def run_sequential(self, set_index, tags):
+        # One access at a time in stream order; also the reference the lockstep version is checked against
+        hits = np.zeros(len(set_index), dtype=bool)
+        for position, (s, tag) in enumerate(zip(set_index.tolist(), tags.tolist())):
+            ways = self.tags[s].tolist()
+            if tag in ways:
+                way = ways.index(tag)
+                hits[position] = True
+            else:
+                way = int(self.last_used[s].argmin())
+                self.tags[s, way] = tag
+            self.last_used[s, way] = self.clock + position
+        return hits
+
+    def misses(self, addresses):
+        return int(np.count_nonzero(~self.run(addresses)))
+
+    def stats(self):
+        misses = self.accesses - self.hits
+        return dict(
+            accesses=self.accesses,
+            hits=self.hits,
+            hit_rate=self.hits / self.accesses if self.accesses else 0.,
+            cycles=self.hits * HIT_CYCLES + misses * MISS_CYCLES,
+        )
+
+
+def check_lockstep(streams, line_size=64, sets=64, ways=8):
+    # Runs the streams one after the other through both implementations, so warm caches are
+    # compared as well. Returns the number of accesses whose hit or miss differs.
+    lockstep, sequential = Cache(line_size, sets, ways), Cache(line_size, sets, ways)
+    mismatches = 0
+    for addresses in streams:
+        mismatches += int(np.count_nonzero(lockstep.run(addresses, sequential=False) !=
+                                           sequential.run(addresses, sequential=True)))
+    return mismatches
@@ -0,0 +1,111 @@
+import json
+import os
+import random
+import shutil
+
+from manim import *
+from manim.utils.family import extract_mobject_family_members
+import numpy as np
+
+from SceneState import mobject_state_hash, style_attributes
+
+
+class SceneCheckpoints:
+    # Scene state at every pause() boundary. construct() is plain Python, so resuming still
+    # replays it, but with animations skipped; the checkpoint then restores the state the full
+    # render had at that pause (RNG, geometry and the trackers registered with track()).
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.name = type(scene).__name__
+        self.folder = os.path.join(scene.output_folder, "checkpoints", self.name)
+        self.index_file = os.path.join(scene.output_folder, "checkpoints", self.name + ".json")
+        self.checkpoints = []
+        self.trackers = []
+
+    def track(self, *trackers):
+        # ValueTrackers that drive always_redraw mobjects are not part of the scene, so the
+        # slide names them; they are saved and restored in the order they were registered
+        self.trackers.extend(trackers)
+
+    def family(self):
+        return extract_mobject_family_members(self.scene.mobjects)
+
+    def save(self):
+        family = self.family()
+        checkpoint = dict(
+            pause=len(self.scene.slides),
+            animation=self.scene.current_animation,
+            random_state=random.getstate(),
+            trackers=[tracker.get_value() for tracker in self.trackers],
+            mobjects=len(family),
+            state_hash=mobject_state_hash(*self.scene.mobjects),
+        )
+        arrays = {}
+        for i, mob in enumerate(family):
+            arrays[f"points_{i}"] = mob.points
+            for attribute in style_attributes:
+                value = getattr(mob, attribute, None)
+                if value is not None:
+                    arrays[f"{attribute}_{i}"] = value
+
+        os.makedirs(self.folder, exist_ok=True)
+        np.savez(os.path.join(self.folder, f"{checkpoint['pause']}.npz"), **arrays)
+        self.checkpoints.append(checkpoint)
+        with open(self.index_file, "w") as f:
+            json.dump(dict(checkpoints=self.checkpoints), f)
+
+    def load(self):
+        if not os.path.exists(self.index_file):
+            return []
+        with open(self.index_file) as f:
+            return json.load(f)["checkpoints"]
+
+    def plan_resume(self, pause):
+        # Skip every play before the checkpoint and stop before the next one
+        checkpoints = {c["pause"]: c for c in self.load()}
+        if pause not in checkpoints:
+            logger.warning(f"{self.name}: no checkpoint for pause {pause}, rendering the whole scene")
+            return None
+        checkpoint = checkpoints[pause]
+        config.from_animation_number = checkpoint["animation"]
+        if pause + 1 in checkpoints:
+            config.upto_animation_number = checkpoints[pause + 1]["animation"] - 1
+        return checkpoint
+
+    def restore(self, checkpoint):
+        version, state, gauss = checkpoint["random_state"]
+        random.setstate((version, tuple(state), gauss))
+        if len(checkpoint["trackers"]) == len(self.trackers):
+            for tracker, value in zip(self.trackers, checkpoint["trackers"]):
+                tracker.set_value(value)
+        else:
+            logger.warning(f"{self.name}: checkpoint {checkpoint['pause']} has other trackers, not restoring them")
+        if mobject_state_hash(*self.scene.mobjects) == checkpoint["state_hash"]:
+            return
+
+        family = self.family()
+        if len(family) != checkpoint["mobjects"]:
+            logger.warning(f"{self.name}: checkpoint {checkpoint['pause']} is stale, continuing from replayed state")
+            return
+        arrays = np.load(os.path.join(self.folder, f"{checkpoint['pause']}.npz"))
+        for i, mob in enumerate(family):
+            mob.points = arrays[f"points_{i}"]
+            for attribute in style_attributes:
+                if f"{attribute}_{i}" in arrays:
+                    setattr(mob, attribute, arrays[f"{attribute}_{i}"])
+
+    def patch_presentation(self):
+        # Swap the re-rendered partial movies into the existing presentation, keep all others
+        presentation_file = os.path.join(self.scene.output_folder, self.name + ".json")
+        with open(presentation_file) as f:
+            presentation = json.load(f)
+        files = presentation["files"]
+        for index, src in enumerate(self.scene.renderer.file_writer.partial_movie_files):
+            if src is None or index >= len(files):
+                continue
+            dst = os.path.join(os.path.dirname(files[index]), os.path.basename(src))
+            shutil.copyfile(src, dst)
+            files[index] = dst
+        with open(presentation_file, "w") as f:
+            json.dump(presentation, f)
@@ -0,0 +1,152 @@
+import math
+import os
+
+from manim import *
+import numpy as np
+from manim_presentation import Slide
+
+from Checkpoint import SceneCheckpoints
+from DryRun import DryRunReport
+from SceneState import mobject_state_hash
+from Updaters import DependentUpdater
+
+
+class LazyMobject:
+    # Class level mobject that is built on first access and shared from then on. Importing the
+    # deck no longer lays out every title, and instances can still shadow it with self.title = ...
+
+    def __init__(self, build):
+        self.build = build
+        self.mobject = None
+
+    def __get__(self, instance, owner):
+        if self.mobject is None:
+            self.mobject = self.build()
+        return self.mobject
+
+
+class DeckSlide(Slide):
+    # Frames rendered at the start of a wait to find out whether its non time based updaters move anything
+    static_probe_time = 0.25
+    # DECK_FROM_PAUSE=n re-renders only the segment after the n-th pause of an earlier full render
+    resume_from_pause = int(os.environ.get("DECK_FROM_PAUSE", 0))
+    resume_checkpoint = None
+    # DECK_CHECKPOINTS=1 saves the scene state at every pause, which DECK_FROM_PAUSE needs
+    save_checkpoints = bool(os.environ.get("DECK_CHECKPOINTS"))
+    # Set by dry_run.py: advance animations on a coarse grid without rendering anything
+    dry_run = False
+    dry_run_fps = 4
+    # DECK_MEMORY_PROFILE=1 samples memory at every play and pause and writes <output>/memory/<slide>.memory.json
+    profile_memory = bool(os.environ.get("DECK_MEMORY_PROFILE"))
+    # DECK_HEAP_TRACE=<trace file> drives the heap slides from a recorded malloc/free trace
+    heap_trace = os.environ.get("DECK_HEAP_TRACE")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkpoints = SceneCheckpoints(self)
+
+    def setup(self):
+        super().setup()
+        self.static_wait_time = 0
+        self.updater_counts = DependentUpdater.total_calls, DependentUpdater.total_skipped
+        self.dry_run_report = DryRunReport(type(self).__name__)
+        self.memory_profile = None
+        if self.profile_memory:
+            # tracemalloc and resource are only loaded when profiling
+            from MemoryProfile import MemoryProfile
+            self.memory_profile = MemoryProfile(self)
+
+    def play(self, *args, **kwargs):
+        if self.dry_run:
+            self.dry_play(*args, **kwargs)
+        else:
+            super().play(*args, **kwargs)
+        if self.memory_profile is not None:
+            self.memory_profile.sample("play")
+
+    def dry_play(self, *args, **kwargs):
+        # compile_animation_data() without its renderer.save_static_frame_data(), which would
+        # rasterize the static mobjects with cairo
+        self.animations = self.compile_animations(*args, **kwargs)
+        self.add_mobjects_from_animations(self.animations)
+        self.moving_mobjects = self.get_moving_mobjects(*self.animations)
+        self.static_mobjects = self.get_restructured_mobject_list(self.mobjects, self.moving_mobjects)
+        self.begin_animations()
+        run_time = self.get_run_time(self.animations)
+        self.last_t = 0
+        for t in np.linspace(0, run_time, math.ceil(run_time * self.dry_run_fps) + 1)[1:]:
+            self.update_to_time(t)
+        for animation in self.animations:
+            animation.finish()
+            animation.clean_up_from_scene(self)
+        self.update_mobjects(0)
+        self.current_animation += 1
+        self.dry_run_report.add_play(run_time)
+
+    def has_time_based_updaters(self):
+        return bool(self.updaters) or any(m.has_time_based_updater() for m in self.get_mobject_family_members())
+
+    def wait(self, duration=DEFAULT_WAIT_TIME, stop_condition=None, frozen_frame=None):
+        # Scene.should_update_mobjects() reads self.animations, which is unset or stale before a wait
+        time_based = self.has_time_based_updaters()
+        would_render_frames = frozen_frame is False or (
+                frozen_frame is None and (self.always_update_mobjects or time_based))
+        # A time based updater may start moving after the probe, so those waits are never frozen
+        if not would_render_frames or time_based or stop_condition is not None or \
+                duration <= self.static_probe_time:
+            return super().wait(duration, stop_condition=stop_condition, frozen_frame=frozen_frame)
+
+        states = {mobject_state_hash(*self.mobjects)}
+
+        def probe(dt):
+            states.add(mobject_state_hash(*self.mobjects))
+
+        self.add_updater(probe)
+        super().wait(self.static_probe_time, frozen_frame=False)
+        self.remove_updater(probe)
+
+        # Nothing changed while updaters ran: write the last frame repeatedly instead of redrawing it
+        is_static = len(states) == 1
+        if is_static:
+            self.static_wait_time += duration - self.static_probe_time
+        super().wait(duration - self.static_probe_time, frozen_frame=is_static)
+
+    def pause(self):
+        super().pause()
+        if self.memory_profile is not None:
+            self.memory_profile.sample("pause")
+        if self.dry_run:
+            self.dry_run_report.end_segment(self.mobjects)
+        elif self.resume_checkpoint is None:
+            if self.save_checkpoints and not config.dry_run:
+                self.checkpoints.save()
+        elif len(self.slides) == self.resume_checkpoint["pause"]:
+            self.checkpoints.restore(self.resume_checkpoint)
+
+    def render(self, *args, **kwargs):
+        if self.resume_from_pause:
+            self.resume_checkpoint = self.checkpoints.plan_resume(self.resume_from_pause)
+        if self.resume_checkpoint is None:
+            return super().render(*args, **kwargs)
+
+        # Like Slide.render, but only the re-rendered segment is copied into the presentation
+        max_files_cached = config["max_files_cached"]
+        config["max_files_cached"] = float("inf")
+        super(Slide, self).render(*args, **kwargs)
+        config["max_files_cached"] = max_files_cached
+        config.from_animation_number = 0
+        config.upto_animation_number = float("inf")
+        self.checkpoints.patch_presentation()
+
+    def tear_down(self):
+        super().tear_down()
+        if self.dry_run:
+            self.dry_run_report.finish(self.mobjects)
+        if self.memory_profile is not None:
+            self.memory_profile.write(os.path.join(self.output_folder, "memory"))
+        if self.static_wait_time > 0:
+            logger.info(f"{type(self).__name__}: {self.static_wait_time:.2f}s of waits detected as static")
+        calls = DependentUpdater.total_calls - self.updater_counts[0]
+        skipped = DependentUpdater.total_skipped - self.updater_counts[1]
+        if calls + skipped > 0:
+            logger.info(f"{type(self).__name__}: skipped {skipped} of {calls + skipped} dependent updater calls")
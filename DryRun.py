@@ -0,0 +1,78 @@
+from manim import *
+import numpy as np
+
+
+def describe(mob):
+    text = getattr(mob, "text", None) or getattr(mob, "original_text", None)
+    if text:
+        return f"{type(mob).__name__} '{text.strip()[:30]}'"
+    return type(mob).__name__
+
+
+def bounding_boxes(mobjects):
+    return np.array([[mob.get_left()[0], mob.get_right()[0], mob.get_bottom()[1], mob.get_top()[1]]
+                     for mob in mobjects])
+
+
+def layout_warnings(mobjects, tolerance=1e-2):
+    visible = [m for m in mobjects if not isinstance(m, ValueTracker) and len(m.get_all_points()) > 0]
+    if not visible:
+        return []
+    warnings = []
+    left, right, bottom, top = bounding_boxes(visible).T
+
+    outside = (left < -config.frame_x_radius - tolerance) | (right > config.frame_x_radius + tolerance) | \
+              (bottom < -config.frame_y_radius - tolerance) | (top > config.frame_y_radius + tolerance)
+    for i in np.flatnonzero(outside):
+        warnings.append(f"out of frame: {describe(visible[i])}")
+
+    # Partial overlaps only: blocks inside the heap or a title over its slide are intended
+    overlap_x = np.minimum(right[:, None], right[None, :]) - np.maximum(left[:, None], left[None, :])
+    overlap_y = np.minimum(top[:, None], top[None, :]) - np.maximum(bottom[:, None], bottom[None, :])
+    overlaps = (overlap_x > tolerance) & (overlap_y > tolerance)
+    inside = (left[:, None] >= left[None, :] - tolerance) & (right[:, None] <= right[None, :] + tolerance) & \
+             (bottom[:, None] >= bottom[None, :] - tolerance) & (top[:, None] <= top[None, :] + tolerance)
+    overlaps &= ~inside & ~inside.T
+    for i, j in zip(*np.nonzero(np.triu(overlaps, k=1))):
+        warnings.append(f"overlap: {describe(visible[i])} / {describe(visible[j])}")
+    return warnings
+
+
+class DryRunReport:
+
+    def __init__(self, name):
+        self.name = name
+        self.segments = []
+        self.start_segment()
+
+    def start_segment(self):
+        self.segments.append(dict(plays=0, run_time=0., warnings=[]))
+
+    def add_play(self, run_time):
+        self.segments[-1]["plays"] += 1
+        self.segments[-1]["run_time"] += run_time
+
+    def end_segment(self, mobjects):
+        self.segments[-1]["warnings"] = layout_warnings(mobjects)
+        self.start_segment()
+
+    def finish(self, mobjects):
+        if self.segments[-1]["plays"] > 0:
+            self.segments[-1]["warnings"] = layout_warnings(mobjects)
+        else:
+            self.segments.pop()
+
+    @property
+    def run_time(self):
+        return sum(segment["run_time"] for segment in self.segments)
+
+    def as_dict(self):
+        return dict(name=self.name, run_time=self.run_time, segments=self.segments)
+
+    def format(self):
+        lines = [f"{self.name:<28} {self.run_time:7.1f}s"]
+        for number, segment in enumerate(self.segments, start=1):
+            lines.append(f"  segment {number:<3} {segment['plays']:4d} plays {segment['run_time']:7.1f}s"
+                         f" {len(segment['warnings']):3d} warnings")
+            lines.extend(f"      {warning}" for warning in segment["warnings"])
+        return "\n".join(lines)
@@ -0,0 +1,112 @@
+import math
+import random
+
+from HeapTrace import FREE, MALLOC
+
+# Event streams for the heap slides: ("free", idx), ("reuse", idx, width), ("new", idx) for the
+# general heap and ("free", idx), ("use", idx) for the fixed block allocator. The synthetic
+# generators draw from `random` in exactly the order the slides always did, so seeded renders
+# stay identical; the trace generators replay a downsampled allocation trace instead.
+
+
+def fragmentation_events(block_widths, num_filled, steps, min_block_size):
+    widths = list(block_widths)
+    filled_blocks = list(range(num_filled))
+    free_blocks = []
+    for i in range(steps):
+        if random.random() < 0.4:  # free
+            idx = random.choice(filled_blocks)
+            filled_blocks.remove(idx)
+            free_blocks.append(idx)
+            yield "free", idx
+        else:
+            if random.random() < 0.4 and len(free_blocks) > 0:  # use freed
+                idx = random.choice(free_blocks)
+                widths[idx] = random.random() * (widths[idx] - min_block_size) + min_block_size
+                filled_blocks.append(idx)
+                free_blocks.remove(idx)
+                yield "reuse", idx, widths[idx]
+            else:
+                if len(filled_blocks) > 0:  # new space
+                    idx = max(filled_blocks) + 1
+                    if idx < len(widths):
+                        filled_blocks.append(idx)
+                        yield "new", idx
+
+
+def trace_fragmentation_events(trace, block_widths, num_filled, min_block_size, max_block_size):
+    widths = list(block_widths)
+    sizes = trace["size"][trace["op"] == MALLOC]
+    if len(sizes) == 0:
+        return
+    low, high = math.log(max(1, sizes.min())), math.log(max(1, sizes.max()))
+
+    def width_for(size):
+        fraction = (math.log(max(1, size)) - low) / (high - low) if high > low else 1.
+        return min_block_size + fraction * (max_block_size - min_block_size)
+
+    # The blocks filled before the events start stand for the trace's first allocations
+    prefilled = list(range(num_filled))
+    next_new = num_filled
+    slots = {}
+    free_blocks = []
+    for event in trace:
+        ptr = int(event["ptr"])
+        if event["op"] == FREE:
+            if ptr in slots:
+                idx = slots.pop(ptr)
+                free_blocks.append(idx)
+                yield "free", idx
+            continue
+        if prefilled:
+            slots[ptr] = prefilled.pop(0)
+            continue
+        width = width_for(int(event["size"]))
+        fitting = [idx for idx in free_blocks if widths[idx] >= width]
+        if fitting:  # first fit into a hole
+            idx = fitting[0]
+            free_blocks.remove(idx)
+            widths[idx] = width
+            slots[ptr] = idx
+            yield "reuse", idx, width
+        elif next_new < len(widths):
+            slots[ptr] = next_new
+            next_new += 1
+            yield "new", slots[ptr]
+
+
+def allocator_events(filled_blocks, free_blocks, steps):
+    # The block lists are shared with the free list popup, so they change only after each event played
+    for i in range(steps):
+        if random.random() < 0.3 and len(filled_blocks) > 0:  # free
+            idx = random.choice(filled_blocks)
+            yield "free", idx
+            filled_blocks.remove(idx)
+            free_blocks.append(idx)
+        else:
+            if len(free_blocks) > 0:
+                idx = free_blocks[-1]
+                yield "use", idx
+                filled_blocks.append(idx)
+                free_blocks.remove(idx)
+
+
+def trace_allocator_events(trace, filled_blocks, free_blocks):
+    prefilled = list(filled_blocks)
+    slots = {}
+    for event in trace:
+        ptr = int(event["ptr"])
+        if event["op"] == MALLOC:
+            if prefilled:
+                slots[ptr] = prefilled.pop(0)
+            elif len(free_blocks) > 0:  # a full pool drops the allocation
+                idx = free_blocks[-1]
+                slots[ptr] = idx
+                yield "use", idx
+                filled_blocks.append(idx)
+                free_blocks.remove(idx)
+        elif ptr in slots:
+            idx = slots.pop(ptr)
+            yield "free", idx
+            filled_blocks.remove(idx)
+            free_blocks.append(idx)
@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+
+MALLOC, FREE = 0, 1
+
+# Binary traces are packed little endian records of this layout, text traces have one
+# "timestamp op size ptr" line per event (op is malloc/m or free/f, ptr hex or decimal)
+TRACE_DTYPE = np.dtype([("timestamp", "<f8"), ("op", "u1"), ("size", "<u8"), ("ptr", "<u8")])
+
+CHUNK_EVENTS = 1 << 16
+TEXT_OPS = {"m": MALLOC, "malloc": MALLOC, "f": FREE, "free": FREE}
+
+
+def is_binary(path):
+    return path.endswith(".bin")
+
+
+def read_text_chunks(path, chunk_events):
+    chunk = []
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            timestamp, op, size, ptr = fields
+            chunk.append((float(timestamp), TEXT_OPS[op.lower()], int(size), int(ptr, 0)))
+            if len(chunk) == chunk_events:
+                yield np.array(chunk, dtype=TRACE_DTYPE)
+                chunk = []
+    if chunk:
+        yield np.array(chunk, dtype=TRACE_DTYPE)
+
+
+def read_trace(path, chunk_events=CHUNK_EVENTS):
+    # Chunks of events; binary traces are memory mapped, text traces streamed line by line
+    if not is_binary(path):
+        yield from read_text_chunks(path, chunk_events)
+        return
+    records = np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+    for start in range(0, len(records), chunk_events):
+        yield np.array(records[start:start + chunk_events])
+
+
+def count_mallocs(path):
+    return sum(int(np.count_nonzero(chunk["op"] == MALLOC)) for chunk in read_trace(path))
+
+
+def downsample(path, budget):
+    # Keep every stride-th allocation together with its free, so the sample stays a valid trace
+    stride = max(1, math.ceil(count_mallocs(path) / max(1, budget // 2)))
+    live = set()
+    kept = []
+    mallocs_seen = 0
+    for chunk in read_trace(path):
+        is_malloc = chunk["op"] == MALLOC
+        ordinal = mallocs_seen + np.cumsum(is_malloc) - 1
+        mallocs_seen += int(np.count_nonzero(is_malloc))
+        kept_malloc = is_malloc & (ordinal % stride == 0)
+        # Frees can only be kept if their pointer was sampled; check the exact order on those few only
+        candidates = kept_malloc | (~is_malloc & np.isin(chunk["ptr"], np.fromiter(live, np.uint64, len(live))))
+        candidates |= ~is_malloc & np.isin(chunk["ptr"], chunk["ptr"][kept_malloc])
+        for event in chunk[candidates]:
+            if event["op"] == MALLOC:
+                live.add(int(event["ptr"]))
+                kept.append(event)
+            elif int(event["ptr"]) in live:
+                live.remove(int(event["ptr"]))
+                kept.append(event)
+    return np.array(kept, dtype=TRACE_DTYPE)
+
+
+def write_trace(path, events):
+    events = np.asarray(events, dtype=TRACE_DTYPE)
+    if is_binary(path):
+        events.tofile(path)
+        return
+    with open(path, "w") as f:
+        for event in events:
+            op = "malloc" if event["op"] == MALLOC else "free"
+            f.write(f"{event['timestamp']:.6f} {op} {event['size']} {event['ptr']:#x}\n")
+
+
+def synthetic_trace(events, seed=0, min_size=8, max_size=4096, free_probability=0.4):
+    # Log uniform allocation sizes; a free releases a random live allocation
+    rng = np.random.default_rng(seed)
+    sizes = np.exp(rng.uniform(np.log(min_size), np.log(max_size), events)).astype(np.uint64)
+    frees = rng.random(events) < free_probability
+    trace = np.zeros(events, dtype=TRACE_DTYPE)
+    trace["timestamp"] = np.arange(events)
+    live = []
+    next_ptr = 0x1000
+    for i in range(events):
+        if frees[i] and live:
+            trace[i]["op"] = FREE
+            trace[i]["ptr"] = live.pop(int(rng.integers(len(live))))
+        else:
+            trace[i]["size"] = sizes[i]
+            trace[i]["ptr"] = next_ptr
+            live.append(next_ptr)
+            next_ptr += -(-int(sizes[i]) // 16) * 16
+    return trace
@@ -0,0 +1,74 @@
+from manim import *
+
+ROW_COLORS = [RED_A, GREEN_A, BLUE_A, YELLOW_A, PURPLE_A]
+
+
+def pool_rows(heap_width, spacing, min_block_width, displayed_rows):
+    # Blocks per row of the XAllocator heap: the block width doubles from row to row
+    return [int((heap_width - spacing) / (min_block_width * 2 ** j + spacing)) for j in range(displayed_rows)]
+
+
+def heap_row_blocks(blocks, heap, displayed_rows, spacing, row_colors=ROW_COLORS):
+    # Draws model.blocks() into `heap` the way XAllocator lays out its pools, one row per pool or
+    # top level block. Used blocks are filled, their requested bytes gold and the rest is slack.
+    block_height = (heap.height - spacing * (displayed_rows + 1)) / displayed_rows
+    row_width = heap.width - spacing
+    left, top = heap.get_left()[0] + spacing, heap.get_top()[1] - spacing
+    rectangles = VGroup()
+    for row, start, width, requested in blocks:
+        if row >= displayed_rows:
+            continue
+        block_width = width * row_width - spacing
+        center = [left + start * row_width + block_width / 2.,
+                  top - row * (block_height + spacing) - block_height / 2., 0]
+        color = row_colors[row % len(row_colors)]
+        rectangles.add(Rectangle(width=block_width, height=block_height, color=color,
+                                 fill_opacity=0 if requested is None else 0.5).move_to(center))
+        if requested is not None:
+            used_width = block_width * min(requested, 1.)
+            rectangles.add(Rectangle(width=used_width, height=block_height, color=GOLD_E, fill_opacity=0.5)
+                           .move_to(center).shift(LEFT * (block_width - used_width) / 2.))
+    return rectangles
+
+
+def vector_cells(used, capacity, cell_width, color=BLUE_A):
+    # One square per element slot, the used ones filled
+    return VGroup(*[Square(side_length=cell_width, color=color, fill_opacity=0.5 if i < used else 0)
+                    for i in range(capacity)]).arrange(RIGHT, buff=0)
+
+
+def vector_stats_text(vector):
+    stats = vector.stats()
+    return Text(f"copied {stats['copy_bytes']} B   peak {stats['peak_bytes']} B   "
+                f"slack {stats['slack_bytes']} B").scale(0.4)
+
+
+def cache_panel(report):
+    # Hit rates per container of the global heap and the fixed block placement, and how many
+    # cycles the fixed block one needs relative to the global heap. Takes a cache_report().
+    rows = [[workload, f"{placements['scattered']['hit_rate']:.0%}", f"{placements['pool']['hit_rate']:.0%}",
+             f"{placements['pool']['cycles'] / placements['scattered']['cycles']:.2f}x"]
+            for workload, placements in report["workloads"].items()]
+    table = Table(rows, col_labels=[Text("Container"), Text("Global Heap"), Text("Fixed Block"), Text("Cycles")])
+    cache = report["cache"]
+    size = cache["line_size"] * cache["sets"] * cache["ways"] // 1024
+    caption = Text(f"Cache hits ({size} KiB, {cache['ways']} way)").scale(1.4)
+    return VGroup(caption, table).arrange(DOWN)
+
+
+def stats_table(stats):
+    columns = ["Size", "In use", "Peak", "Allocs", "Frees", "Failed", "Slack"]
+    rows = [[str(value) for value in row] for row in zip(
+        stats.sizes, stats.in_use, stats.high_water, stats.allocations, stats.frees, stats.failed, stats.slack_bytes)]
+    return Table(rows, col_labels=[Text(column) for column in columns])
+
+
+def stats_overlay(stats, place):
+    # Live PoolStats table; `place` scales and positions it. Rebuilt only when the counters changed.
+    built = {}
+
+    def redraw():
+        if built.get("version") != stats.version:
+            built["version"], built["table"] = stats.version, place(stats_table(stats))
+        return built["table"].copy()
+    return always_redraw(redraw)
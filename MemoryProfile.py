@@ -0,0 +1,67 @@
+import gc
+import json
+import os
+import sys
+import tracemalloc
+import weakref
+
+from manim import *
+from manim.utils.family import extract_mobject_family_members
+
+from DryRun import describe
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ru_maxrss is in bytes on macOS and in KiB on Linux
+MAX_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+class MemoryProfile:
+    # Samples the scene at every play and pause. Mobjects that left the scene are only weakly
+    # referenced here, so if they are still alive something else keeps them reachable.
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.name = type(scene).__name__
+        self.seen = weakref.WeakValueDictionary()
+        self.samples = []
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # The peak of the previous slide would otherwise carry over
+        tracemalloc.reset_peak()
+
+    def sample(self, event):
+        family = extract_mobject_family_members(self.scene.mobjects)
+        in_scene = {id(mob) for mob in family}
+        for mob in self.scene.mobjects:
+            self.seen[id(mob)] = mob
+
+        gc.collect()
+        removed = [mob for key, mob in list(self.seen.items()) if key not in in_scene]
+        current, peak = tracemalloc.get_traced_memory()
+        self.samples.append(dict(
+            event=event,
+            animation=self.scene.current_animation,
+            mobjects=len(family),
+            point_bytes=sum(mob.points.nbytes for mob in family),
+            python_heap=current,
+            python_heap_peak=peak,
+            max_rss=None if resource is None else resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAX_RSS_UNIT,
+            removed_but_reachable=len(removed),
+            removed_point_bytes=sum(m.points.nbytes for mob in removed for m in mob.get_family()),
+        ))
+        if event == "pause":
+            self.samples[-1]["removed_examples"] = [describe(mob) for mob in removed[:10]]
+
+    def write(self, folder):
+        os.makedirs(folder, exist_ok=True)
+        peak = max(self.samples, key=lambda s: s["python_heap"], default=None)
+        with open(os.path.join(folder, f"{self.name}.memory.json"), "w") as f:
+            json.dump(dict(slide=self.name, peak=peak, samples=self.samples), f, indent=1)
+        if peak is not None:
+            logger.info(f"{self.name}: peak Python heap {peak['python_heap'] / 2 ** 20:.1f} MiB at animation "
+                        f"{peak['animation']}, {self.samples[-1]['removed_but_reachable']} removed mobjects "
+                        f"still reachable at the end")
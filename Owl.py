@@ -1,7 +1,11 @@
+from functools import lru_cache
+
 from manim import *
 import numpy.linalg as LA
 import numpy as np
 
+from ArcOutline import circle, half_disc
+
 draw_color = WHITE
 
 
@@ -40,6 +44,10 @@ class Owl:
         self.right_wing_rotation = ValueTracker(self.default_arm_angle)
         self.left_wing_rotation = ValueTracker(-self.default_arm_angle)
 
+    def trackers(self):
+        return [self.skull_rotation, self.pupil_pos_x, self.pupil_pos_y, self.left_ear_rotation,
+                self.right_ear_rotation, self.right_wing_rotation, self.left_wing_rotation]
+
     def draw(self):
 
         head = self.create_head()
@@ -178,3 +186,40 @@ class Owl:
     def ear_wink(self):
         return self.right_ear_rotation.animate(run_time=0.5, rate_func=rate_functions.there_and_back).set_value(1)
 
+
+def skull_half_outline(radius, ear_size, ear_rotation):
+    # The ear is a half disc rotated about the middle of its flat edge
+    return circle((0, 0), radius).union(half_disc((-radius * 0.3, radius), ear_size, ear_rotation))
+
+
+@lru_cache(maxsize=256)
+def skull_points(radius, width, ear_size, left_ear_rotation, right_ear_rotation):
+    left_half = skull_half_outline(radius, ear_size, left_ear_rotation).shift((-width / 2., 0))
+    # Same as flip(Y_AXIS): mirrored about the middle of the half's own bounding box
+    right_half = skull_half_outline(radius, ear_size, right_ear_rotation)
+    x = right_half.bezier_points()[:, 0]
+    right_half = right_half.mirror_x((x.min() + x.max()) / 2.).shift((width / 2., 0))
+    points = right_half.union(left_half).bezier_points()
+    points.setflags(write=False)
+    return points
+
+
+class AnalyticOwl(Owl):
+    # Builds the head outlines from arcs and lines; only the body and wing gaps still use Boolean ops
+
+    def outline_mobject(self, points):
+        outline = VMobject()
+        outline.set_points(points)
+        return outline
+
+    def create_ear(self, ear_size):
+        return self.outline_mobject(half_disc((0, 0), ear_size, 0).bezier_points())
+
+    def create_skull_half(self, ear_rotation):
+        return self.outline_mobject(
+            skull_half_outline(self.skull_height, self.ear_size, ear_rotation.get_value()).bezier_points())
+
+    def create_skull(self):
+        return self.outline_mobject(skull_points(self.skull_height, self.skull_width, self.ear_size,
+                                                 float(self.left_ear_rotation.get_value()),
+                                                 float(self.right_ear_rotation.get_value())))
@@ -0,0 +1,134 @@
+from collections import OrderedDict
+
+from manim import *
+import numpy as np
+
+from Owl import Owl
+
+# Columns of a pose row, named after the Owl trackers they replace
+POSE_FIELDS = ("skull_rotation", "pupil_pos_x", "pupil_pos_y", "left_ear_rotation", "right_ear_rotation",
+               "right_wing_rotation", "left_wing_rotation")
+# Style a SharedShape takes over from its source; only references are copied
+STYLE_ATTRIBUTES = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width", "background_stroke_width",
+                    "sheen_factor", "sheen_direction", "z_index")
+
+
+class SharedShape(VMobject):
+    # One part of a cached pose shape, drawn at an offset. Its points are formed only when they
+    # are read, by the renderer, so every owl in a pose shares the shape's arrays. Setting the
+    # points (shift, become, an animation of the owl itself, ...) turns it into an ordinary
+    # VMobject with its own copy; OwlFlock.update() attaches such owls again.
+
+    def __init__(self, source=None, offset=ORIGIN, **kwargs):
+        self.source = None
+        self.own_points = np.zeros((0, 3))
+        super().__init__(**kwargs)
+        if source is not None:
+            self.attach(source, offset)
+
+    @property
+    def points(self):
+        if self.source is None:
+            return self.own_points
+        return self.source.points + self.offset
+
+    @points.setter
+    def points(self, points):
+        self.source = None
+        self.own_points = points
+
+    def attach(self, source, offset):
+        self.source = source
+        self.offset = offset
+        for name in STYLE_ATTRIBUTES:
+            if hasattr(source, name):
+                setattr(self, name, getattr(source, name))
+        if len(self.submobjects) == len(source.submobjects):
+            for part, source_part in zip(self.submobjects, source.submobjects):
+                part.attach(source_part, offset)
+        else:
+            self.remove(*self.submobjects)
+            self.add(*[SharedShape(source_part, offset) for source_part in source.submobjects])
+        return self
+
+
+class OwlFlock:
+    # Many owls with all poses in one (n, 7) array. Poses are quantized to `resolution` and every
+    # distinct quantized pose is drawn once by a single scratch Owl; the owls are SharedShapes of
+    # those drawings, so geometry memory and drawing grow with the distinct poses. A changed owl
+    # only swaps references. Cairo still rasterizes every owl, and the shifted points it reads
+    # are formed per frame without being kept.
+
+    def __init__(self, positions, scale=1., resolution=0.005, max_cached_poses=256, owl_class=Owl):
+        self.positions = np.asarray(positions, dtype=float)
+        self.scale = scale
+        self.resolution = resolution
+        self.max_cached_poses = max_cached_poses
+        self.owl = owl_class()
+        self.poses = np.tile(self.default_pose(), (len(self.positions), 1))
+        self.keys = None
+        self.geometry = OrderedDict()
+        self.mobject = VGroup(*[SharedShape() for _ in range(len(self.positions))])
+        self.mobject.add_updater(lambda m: self.update())
+        self.update()
+
+    def default_pose(self):
+        return np.array([getattr(self.owl, field).get_value() for field in POSE_FIELDS])
+
+    def field(self, name):
+        return self.poses[:, POSE_FIELDS.index(name)]
+
+    def set_field(self, name, values):
+        self.poses[:, POSE_FIELDS.index(name)] = values
+
+    def geometry_for(self, key):
+        if key in self.geometry:
+            self.geometry.move_to_end(key)
+            return self.geometry[key]
+        for field, value in zip(POSE_FIELDS, key):
+            getattr(self.owl, field).set_value(value * self.resolution)
+        shape = self.owl.draw().scale(self.scale, about_point=ORIGIN)
+        self.geometry[key] = shape
+        if len(self.geometry) > self.max_cached_poses:
+            self.geometry.popitem(last=False)
+        return shape
+
+    def update(self):
+        keys = np.round(self.poses / self.resolution).astype(np.int64)
+        if self.keys is None:
+            changed = np.ones(len(keys), dtype=bool)
+        else:
+            changed = np.any(keys != self.keys, axis=1)
+        changed |= np.array([owl.source is None for owl in self.mobject], dtype=bool)
+        self.keys = keys
+        if not changed.any():
+            return
+        distinct, inverse = np.unique(keys[changed], axis=0, return_inverse=True)
+        shapes = [self.geometry_for(tuple(key)) for key in distinct.tolist()]
+        for owl_index, shape_index in zip(np.flatnonzero(changed), inverse.ravel()):
+            self.mobject[owl_index].attach(shapes[shape_index], self.positions[owl_index])
+
+    def animate_poses(self, target_poses, **kwargs):
+        return FlockPoseAnimation(self, target_poses, **kwargs)
+
+
+class FlockPoseAnimation(Animation):
+
+    def __init__(self, flock, target_poses, **kwargs):
+        self.flock = flock
+        self.target_poses = np.broadcast_to(np.asarray(target_poses, dtype=float), flock.poses.shape).copy()
+        self.start_poses = flock.poses.copy()
+        super().__init__(flock.mobject, **kwargs)
+
+    def create_starting_mobject(self):
+        # Interpolation works on the pose array, a copy of every owl is not needed
+        return Mobject()
+
+    def begin(self) -> None:
+        self.start_poses = self.flock.poses.copy()
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        alpha = self.rate_func(alpha)
+        self.flock.poses[:] = self.start_poses + (self.target_poses - self.start_poses) * alpha
+        self.flock.update()
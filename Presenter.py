@@ -0,0 +1,266 @@
+import argparse
+import collections
+import json
+import mmap
+import os
+import statistics
+import threading
+import time
+
+import av
+import cv2
+
+from slides import slide_names
+
+NEXT_KEYS = {ord(" "), ord("n"), 65363, 2555904, 63235}
+PREVIOUS_KEYS = {ord("p"), 65361, 2424832, 63234}
+REPLAY_KEYS = {ord("r")}
+QUIT_KEYS = {ord("q"), 27}
+CONTROL_KEYS = NEXT_KEYS | PREVIOUS_KEYS | REPLAY_KEYS | QUIT_KEYS
+
+
+def decode_frames(files):
+    # (frame, fps) one at a time; every file is memory mapped and decoded straight from the mapping
+    for path in files:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            with av.open(data) as container:
+                stream = container.streams.video[0]
+                stream.thread_type = "AUTO"
+                fps = float(stream.average_rate)
+                for frame in container.decode(stream):
+                    yield frame.to_ndarray(format="bgr24"), fps
+
+
+class DecodedSegment:
+    # Frames of one segment, decoded by a background thread and readable while it runs. A segment
+    # that fits into max_bytes is kept whole and replays without decoding again. A longer one is
+    # streamed: the decoder waits while the buffer is full and continues where it stopped once
+    # playback released the frames it showed. Only replaying a streamed segment decodes it again.
+
+    def __init__(self, files, max_bytes):
+        self.files = files
+        self.max_bytes = max_bytes
+        self.fps = 60.
+        self.cancelled = False
+        # Bumped by a restart, so the decoder of the previous pass stops
+        self.generation = 0
+        self.condition = threading.Condition()
+        self.reset()
+
+    def reset(self):
+        self.frames = collections.deque()
+        # Number of frames released from the front of the buffer
+        self.first = 0
+        self.nbytes = 0
+        self.streaming = False
+        self.done = False
+        self.error = None
+
+    @property
+    def reserved_bytes(self):
+        # What the segment may still grow to
+        return self.nbytes if self.done else self.max_bytes
+
+    def start(self):
+        threading.Thread(target=self.decode, args=(self.generation,), daemon=True).start()
+
+    def stale(self, generation):
+        return self.cancelled or generation != self.generation
+
+    def decode(self, generation):
+        frames = decode_frames(self.files)
+        try:
+            for frame, fps in frames:
+                with self.condition:
+                    while self.frames and self.nbytes + frame.nbytes > self.max_bytes and not self.stale(generation):
+                        self.streaming = True
+                        self.condition.notify_all()
+                        self.condition.wait()
+                    if self.stale(generation):
+                        return
+                    self.frames.append(frame)
+                    self.fps = fps
+                    self.nbytes += frame.nbytes
+                    self.condition.notify_all()
+        except Exception as error:
+            with self.condition:
+                if not self.stale(generation):
+                    self.error = error
+        finally:
+            frames.close()
+            with self.condition:
+                if not self.stale(generation):
+                    self.done = True
+                    self.condition.notify_all()
+
+    def cancel(self):
+        with self.condition:
+            self.cancelled = True
+            self.frames.clear()
+            self.nbytes = 0
+            self.condition.notify_all()
+
+    def release(self, shown):
+        # Called with the condition held: a streamed segment makes room for the decoder
+        if self.streaming and self.first < shown:
+            while self.first < shown:
+                self.nbytes -= self.frames.popleft().nbytes
+                self.first += 1
+            self.condition.notify_all()
+
+    def __iter__(self):
+        # Frames as soon as they are decoded, the first one does not wait for the whole segment.
+        # One reader at a time: a streamed segment drops the frames it has shown.
+        with self.condition:
+            if self.first > 0:
+                self.generation += 1
+                self.reset()
+                self.start()
+        shown = 0
+        while True:
+            with self.condition:
+                self.release(shown)
+                while shown >= self.first + len(self.frames) and not self.done:
+                    self.condition.wait()
+                    self.release(shown)
+                if self.error is not None:
+                    raise self.error
+                if shown >= self.first + len(self.frames):
+                    break
+                frame = self.frames[shown - self.first]
+            yield frame
+            shown += 1
+
+
+class SegmentCache:
+    # Decoded segments by index. Once the segments could grow past max_bytes the one furthest
+    # from the current one is dropped first; the current segment and the next one are never
+    # dropped. Each segment buffers at most segment_bytes of frames.
+
+    def __init__(self, max_bytes, segment_bytes):
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.segments = {}
+        self.current = 0
+        self.lock = threading.Lock()
+
+    def prefetch(self, index, files):
+        with self.lock:
+            segment = self.segments.get(index)
+            if segment is None:
+                segment = self.segments[index] = DecodedSegment(files, self.segment_bytes)
+                segment.start()
+                self.evict()
+            return segment
+
+    def get(self, index, files):
+        with self.lock:
+            self.current = index
+        segment = self.prefetch(index, files)
+        with self.lock:
+            self.evict()
+        return segment
+
+    def evict(self):
+        kept = {self.current, self.current + 1}
+        while sum(segment.reserved_bytes for segment in self.segments.values()) > self.max_bytes:
+            candidates = [index for index in self.segments if index not in kept]
+            if not candidates:
+                break
+            furthest = max(candidates, key=lambda index: abs(index - self.current))
+            self.segments.pop(furthest).cancel()
+
+    def shutdown(self):
+        with self.lock:
+            for segment in self.segments.values():
+                segment.cancel()
+            self.segments.clear()
+
+
+def load_segments(folder, scenes):
+    segments = []
+    for scene in scenes:
+        with open(os.path.join(folder, f"{scene}.json")) as f:
+            presentation = json.load(f)
+        for slide in presentation["slides"]:
+            files = presentation["files"][slide["start_animation"]:slide["end_animation"]]
+            segments.append(dict(key=(scene, slide["number"]), type=slide["type"], files=files))
+    return segments
+
+
+class Presenter:
+
+    def __init__(self, segments, prefetch=3, max_bytes=1 << 30, fullscreen=False):
+        self.segments = segments
+        self.prefetch_count = prefetch
+        # The current segment, the prefetched ones and one being dropped fit into max_bytes
+        self.cache = SegmentCache(max_bytes, max_bytes // (prefetch + 2))
+        self.latencies = []
+        self.window = "Presentation"
+        cv2.namedWindow(self.window, cv2.WINDOW_NORMAL)
+        if fullscreen:
+            cv2.setWindowProperty(self.window, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+
+    def prefetch(self, current):
+        for index in range(current + 1, min(current + 1 + self.prefetch_count, len(self.segments))):
+            self.cache.prefetch(index, self.segments[index]["files"])
+
+    def play_segment(self, index, requested_at):
+        segment = self.segments[index]
+        frames = self.cache.get(index, segment["files"])
+        self.prefetch(index)
+        while True:
+            start = time.perf_counter()
+            for number, frame in enumerate(frames):
+                cv2.imshow(self.window, frame)
+                if requested_at is not None:
+                    self.latencies.append(time.perf_counter() - requested_at)
+                    requested_at = None
+                frame_time = 1. / frames.fps
+                delay = max(1, int((start + (number + 1) * frame_time - time.perf_counter()) * 1000))
+                key = cv2.waitKeyEx(delay)
+                if key in CONTROL_KEYS:
+                    return key
+            if segment["type"] != "loop":
+                key = cv2.waitKeyEx(0)
+                while key not in CONTROL_KEYS:
+                    key = cv2.waitKeyEx(0)
+                return key
+
+    def run(self):
+        current = 0
+        requested_at = time.perf_counter()
+        while True:
+            key = self.play_segment(current, requested_at)
+            requested_at = time.perf_counter()
+            if key in QUIT_KEYS:
+                break
+            if key in NEXT_KEYS:
+                current = min(current + 1, len(self.segments) - 1)
+            elif key in PREVIOUS_KEYS:
+                current = max(current - 1, 0)
+        self.cache.shutdown()
+        cv2.destroyAllWindows()
+
+    def latency_report(self):
+        if not self.latencies:
+            return "no transitions"
+        latencies = sorted(self.latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return f"{len(latencies)} transitions, mean {statistics.mean(latencies) * 1000:.1f} ms, " \
+               f"p95 {p95 * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Present rendered slides with prefetched segments")
+    parser.add_argument("scenes", nargs="*", help="scenes to present, defaults to the whole deck")
+    parser.add_argument("--folder", default="presentation")
+    parser.add_argument("--prefetch", type=int, default=3, help="segments decoded ahead of the current one")
+    parser.add_argument("--cache-mb", type=int, default=1024, help="memory for decoded frames")
+    parser.add_argument("--fullscreen", action="store_true")
+    args = parser.parse_args()
+
+    presenter = Presenter(load_segments(args.folder, args.scenes or slide_names()), prefetch=args.prefetch,
+                          max_bytes=args.cache_mb << 20, fullscreen=args.fullscreen)
+    presenter.run()
+    print(presenter.latency_report())
@@ -0,0 +1,45 @@
+from functools import lru_cache
+
+from manim import *
+import numpy as np
+
+
+def qr_code_mobject(data, fill_color=BLACK, back_color=WHITE, height=2, border=4):
+    # The cached group is shared, so every caller gets its own copy to animate
+    qr_code = _build_qr_code(data, str(fill_color), str(back_color), border).copy()
+    return qr_code.scale_to_fit_height(height)
+
+
+@lru_cache(maxsize=None)
+def _build_qr_code(data, fill_color, back_color, border):
+    import qrcode
+
+    qr = qrcode.QRCode(border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = np.array(qr.get_matrix(), dtype=bool)
+    size = matrix.shape[0]
+
+    # Every horizontal run of dark modules becomes one rectangular sub path
+    edges = np.diff(np.pad(matrix, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+
+    x0 = starts - size / 2.
+    x1 = ends - size / 2.
+    y0 = size / 2. - rows
+    y1 = y0 - 1
+    z = np.zeros_like(x0)
+    corners = np.stack([np.stack([x0, y0, z], axis=-1),
+                        np.stack([x1, y0, z], axis=-1),
+                        np.stack([x1, y1, z], axis=-1),
+                        np.stack([x0, y1, z], axis=-1)], axis=1)
+    start = corners
+    end = np.roll(corners, -1, axis=1)
+    # Straight cubic bezier segments: anchor, two handles on the line, anchor
+    curves = np.stack([start, start + (end - start) / 3., start + 2 * (end - start) / 3., end], axis=2)
+
+    modules = VMobject(fill_color=fill_color, fill_opacity=1, stroke_width=0)
+    modules.set_points(curves.reshape(-1, 3))
+    background = Square(side_length=size, color=back_color, fill_opacity=1, stroke_width=0)
+    return VGroup(background, modules)
@@ -0,0 +1,26 @@
+import hashlib
+
+from manim.utils.family import extract_mobject_family_members
+
+style_attributes = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+
+
+def mobject_state_hash(*mobjects):
+    # Hash what ends up in a frame, not object identities, so always_redraw rebuilding
+    # identical geometry still counts as unchanged
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in extract_mobject_family_members(mobjects):
+        digest.update(mob.points.tobytes())
+        for attribute in style_attributes:
+            value = getattr(mob, attribute, None)
+            if value is not None:
+                digest.update(value.tobytes())
+        digest.update(repr((getattr(mob, "stroke_width", None), mob.z_index)).encode())
+    return digest.hexdigest()
+
+
+def mobject_points_hash(*mobjects):
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in extract_mobject_family_members(mobjects):
+        digest.update(mob.points.tobytes())
+    return digest.digest()
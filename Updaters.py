@@ -0,0 +1,41 @@
+from SceneState import mobject_points_hash
+
+
+class DependentUpdater:
+    # Totals over all instances, so a slide can report them without keeping every updater alive
+    total_calls = 0
+    total_skipped = 0
+
+    def __init__(self, function, dependencies, track_self=True):
+        self.function = function
+        self.dependencies = tuple(dependencies)
+        self.track_self = track_self
+        self.signature = None
+        self.calls = 0
+        self.skipped = 0
+
+    def tracked_mobjects(self, mob):
+        if self.track_self:
+            return (*self.dependencies, mob)
+        return self.dependencies
+
+    def __call__(self, mob):
+        tracked = self.tracked_mobjects(mob)
+        if mobject_points_hash(*tracked) == self.signature:
+            self.skipped += 1
+            DependentUpdater.total_skipped += 1
+            return
+        self.function(mob)
+        self.calls += 1
+        DependentUpdater.total_calls += 1
+        self.signature = mobject_points_hash(*tracked)
+
+    def __deepcopy__(self, memo):
+        # Mobject.copy() deep copies updaters; a copy must keep following the original anchors
+        return DependentUpdater(self.function, self.dependencies, self.track_self)
+
+
+def add_dependent_updater(mobject, function, *dependencies, track_self=True):
+    updater = DependentUpdater(function, dependencies, track_self)
+    mobject.add_updater(updater)
+    return updater
@@ -0,0 +1,108 @@
+import numpy as np
+
+from AllocatorModels import FixedBlockPools
+
+# Vector models that count what growing costs. Elements are int64 values; sizes are in bytes.
+
+ELEMENT_SIZE = 8
+POINTER_SIZE = 8
+
+
+class DoublingVector:
+    # std::vector: one contiguous buffer, reallocated at twice the capacity and copied when full
+
+    def __init__(self, initial_capacity=1):
+        self.data = np.zeros(initial_capacity, dtype=np.int64)
+        self.size = 0
+        self.copy_bytes = 0
+        self.peak_bytes = self.reserved_bytes()
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def append(self, value):
+        if self.size == len(self.data):
+            grown = np.zeros(2 * len(self.data), dtype=np.int64)
+            grown[:self.size] = self.data
+            # Old and new buffer are both alive while the elements are copied
+            self.peak_bytes = max(self.peak_bytes, (len(self.data) + len(grown)) * ELEMENT_SIZE)
+            self.copy_bytes += self.size * ELEMENT_SIZE
+            self.data = grown
+        self.data[self.size] = value
+        self.size += 1
+
+    def capacity(self):
+        return len(self.data)
+
+    def reserved_bytes(self):
+        return len(self.data) * ELEMENT_SIZE
+
+    def stats(self):
+        return vector_stats(self)
+
+
+class SegmentedVector:
+    # Elements live in fixed size blocks taken from a pool, a chunk directory holds the block
+    # addresses. Appending never moves an element; only the directory grows by doubling and it
+    # holds one pointer per block.
+
+    def __init__(self, pool, block_size):
+        self.pool = pool
+        self.block_size = block_size
+        self.block_elements = block_size // ELEMENT_SIZE
+        self.memory = np.zeros(pool.total_size // ELEMENT_SIZE, dtype=np.int64)
+        self.directory = np.zeros(1, dtype=np.int64)
+        self.blocks = 0
+        self.size = 0
+        self.copy_bytes = 0
+        self.peak_bytes = self.reserved_bytes()
+
+    @classmethod
+    def with_pool(cls, block_size, max_blocks):
+        return cls(FixedBlockPools([block_size], max_blocks), block_size)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        block, offset = divmod(index, self.block_elements)
+        return self.memory[self.directory[block] // ELEMENT_SIZE + offset]
+
+    def append(self, value):
+        block, offset = divmod(self.size, self.block_elements)
+        if offset == 0:
+            address = self.pool.allocate(self.block_size)
+            if address is None:
+                raise MemoryError("segmented vector: block pool exhausted")
+            if self.blocks == len(self.directory):
+                grown = np.zeros(2 * len(self.directory), dtype=np.int64)
+                grown[:self.blocks] = self.directory
+                self.copy_bytes += self.blocks * POINTER_SIZE
+                self.directory = grown
+            self.directory[self.blocks] = address
+            self.blocks += 1
+            self.peak_bytes = max(self.peak_bytes, self.reserved_bytes())
+        self.memory[self.directory[block] // ELEMENT_SIZE + offset] = value
+        self.size += 1
+
+    def capacity(self):
+        return self.blocks * self.block_elements
+
+    def reserved_bytes(self):
+        return self.blocks * self.block_size + len(self.directory) * POINTER_SIZE
+
+    def stats(self):
+        return vector_stats(self)
+
+
+def vector_stats(vector):
+    return dict(
+        size=len(vector),
+        copy_bytes=vector.copy_bytes,
+        peak_bytes=vector.peak_bytes,
+        reserved_bytes=vector.reserved_bytes(),
+        slack_bytes=vector.reserved_bytes() - len(vector) * ELEMENT_SIZE,
+    )
@@ -0,0 +1,127 @@
+import argparse
+import json
+import os
+import time
+
+from manim import *
+
+from Owl import AnalyticOwl, Owl
+from main import CodeAppearAnimation, free_list, heap_block_in_state
+from slides import load_slide, slide_names
+
+BASELINE_FILE = "benchmark_baseline.json"
+
+OWL_POSES = {
+    "rest": {},
+    "wave": {"right_wing_rotation": 2.4, "skull_rotation": 0.3},
+    "point": {"right_wing_rotation": 1.2, "left_wing_rotation": -0.2, "pupil_pos_x": 0.7, "pupil_pos_y": -0.7},
+    "wink": {"right_ear_rotation": 1},
+}
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def owl_draw(pose, owl_class=Owl):
+    owl = owl_class()
+    for tracker, value in OWL_POSES[pose].items():
+        getattr(owl, tracker).set_value(value)
+    return owl.draw
+
+
+def free_list_redraw(entries):
+    allocator_text = Text("MyObj Allocator").scale(0.5)
+    free_blocks = list(range(entries))
+    return lambda: free_list(allocator_text, free_blocks, 1, 0.15)
+
+
+def heap_block_transitions():
+    block = Rectangle(height=0.35, width=1.8, color=GREEN_C, fill_opacity=0.5)
+
+    def run():
+        for _ in range(10):
+            block.become(heap_block_in_state(block, WHITE, 0))
+            block.become(heap_block_in_state(block, GREEN_C, 0.5))
+    return run
+
+
+def code_appear_frames():
+    code = Code(code="new(MyObj)", language="cpp", style="monokai")
+
+    def run():
+        animation = CodeAppearAnimation(code.copy())
+        animation.begin()
+        for alpha in np.linspace(0, 1, 30):
+            animation.interpolate_mobject(alpha)
+    return run
+
+
+def slide_construct(name):
+    slide_class = load_slide(name)
+
+    def run():
+        scene = slide_class()
+        scene.setup()
+        scene.construct()
+        scene.tear_down()
+    return run
+
+
+def benchmarks(include_slides):
+    cases = {f"owl_draw[{pose}]": (owl_draw(pose), 5) for pose in OWL_POSES}
+    cases.update({f"analytic_owl_draw[{pose}]": (owl_draw(pose, AnalyticOwl), 5) for pose in OWL_POSES})
+    cases.update({f"free_list[{entries}]": (free_list_redraw(entries), 5) for entries in (0, 10, 100)})
+    cases["heap_block_transitions"] = (heap_block_transitions(), 5)
+    cases["code_appear_frames"] = (code_appear_frames(), 5)
+    if include_slides:
+        cases.update({f"construct[{name}]": (slide_construct(name), 1) for name in slide_names()})
+    return cases
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the deck's hot paths against a stored baseline")
+    parser.add_argument("--update", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="fail when a case takes longer than threshold times its baseline")
+    parser.add_argument("--only", help="only run cases whose name contains this")
+    parser.add_argument("--skip-slides", action="store_true", help="do not construct the slides")
+    args = parser.parse_args()
+
+    config.quality = "low_quality"
+    config.dry_run = True
+    config.disable_caching = True
+    config.verbosity = "WARNING"
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    for name, (function, repeat) in benchmarks(not args.skip_slides).items():
+        if args.only and args.only not in name:
+            continue
+        seconds = best_time(function, repeat)
+        results[name] = seconds
+        line = f"{name:<40} {seconds * 1000:10.2f} ms"
+        if name in baseline:
+            ratio = seconds / baseline[name]
+            line += f"  {ratio:5.2f}x baseline"
+            if ratio > args.threshold:
+                regressions.append(name)
+                line += "  SLOWER"
+        print(line)
+
+    if args.update:
+        baseline.update(results)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+    elif regressions:
+        raise SystemExit(f"slower than {args.threshold}x baseline: {', '.join(regressions)}")
@@ -0,0 +1,45 @@
+import argparse
+import json
+import time
+
+from manim import *
+
+from slides import load_slide, slide_names
+
+
+def dry_run(slide_class):
+    scene = slide_class()
+    scene.dry_run = True
+    scene.setup()
+    scene.construct()
+    scene.tear_down()
+    return scene.dry_run_report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every slide's construct() without rendering")
+    parser.add_argument("slides", nargs="*", help="slide names, defaults to the whole deck")
+    parser.add_argument("--json", help="also write the report to this file")
+    parser.add_argument("--strict", action="store_true", help="exit with an error if there are layout warnings")
+    args = parser.parse_args()
+
+    config.dry_run = True
+    config.disable_caching = True
+    config.verbosity = "WARNING"
+
+    slides = [load_slide(name) for name in slide_names() if not args.slides or name in args.slides]
+    reports = []
+    start = time.perf_counter()
+    for slide_class in slides:
+        report = dry_run(slide_class)
+        print(report.format())
+        reports.append(report.as_dict())
+    print(f"{len(slides)} slides, {sum(r['run_time'] for r in reports):.1f}s of animation, "
+          f"checked in {time.perf_counter() - start:.1f}s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(slides=reports), f, indent=2)
+    warnings = sum(len(s["warnings"]) for r in reports for s in r["segments"])
+    if args.strict and warnings > 0:
+        raise SystemExit(f"{warnings} layout warnings")
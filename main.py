@@ -1,17 +1,22 @@
 from manim import *
-from manim_presentation import *
+from DeckSlide import DeckSlide, LazyMobject
 from Owl import Owl
 import random
 import math
-from colour import Color
-import qrcode
-import qrcode.image.svg
+import numpy as np
+import os
+from QRMobject import qr_code_mobject
 
+# Importing manim itself is most of the import time. The models and views a single slide needs
+# are imported in its construct(), like colour, so listing or loading one slide does not pay for
+# every other slide's dependencies.
 
-class Welcome(Slide):
+
+class Welcome(DeckSlide):
     def construct(self):
         self.pause()
         owl = Owl()
+        self.checkpoints.track(*owl.trackers())
         myOwl = always_redraw(owl.draw)
         self.add(myOwl)
         self.wait()
@@ -22,13 +27,13 @@ class Welcome(Slide):
         self.wait()
 
 
-class Intro(Slide):
+class Intro(DeckSlide):
     caption = "Why would we want to use fixed sized block allocators?"
-    title = Title(caption)
-    reasons = BulletedList("No memory fragmentation",
-                           "Stable runtime",
-                           "Use of containers (std::list, std::map...)",
-                           "Control over heap usage")
+    title = LazyMobject(lambda: Title(Intro.caption))
+    reasons = LazyMobject(lambda: BulletedList("No memory fragmentation",
+                                               "Stable runtime",
+                                               "Use of containers (std::list, std::map...)",
+                                               "Control over heap usage"))
 
     def construct(self):
         question_text = Text(self.caption).scale(0.5)
@@ -79,10 +84,13 @@ class CodeAppearAnimation(Animation):
         scene.remove(self.mobject)
 
 
-class HeapFragmentationProblem(Slide):
-    title = Title("Why is heap allocation a problem?")
+class HeapFragmentationProblem(DeckSlide):
+    title = LazyMobject(lambda: Title("Why is heap allocation a problem?"))
 
     def construct(self):
+        from HeapEvents import fragmentation_events, trace_fragmentation_events
+        from HeapTrace import downsample
+
         t = Intro.title
         self.add(t)
         caption = Intro.reasons
@@ -150,37 +158,29 @@ class HeapFragmentationProblem(Slide):
              run_time=runtime) for r in
             heap_blocks[:num_start_mallocs]], lag_ratio=0.8))
 
-        filled_blocks = list(range(num_start_mallocs))
-        free_blocks = []
-        for i in range(50):
-            if random.random() < 0.4:  # free
-                idx = random.choice(filled_blocks)
-                self.play(FadeOut(heap_blocks[idx]),
+        if self.heap_trace:
+            trace = downsample(self.heap_trace, 50 + num_start_mallocs)
+            events = trace_fragmentation_events(trace, [r.width for r in heap_blocks], num_start_mallocs,
+                                                min_block_size, max_block_size)
+        else:
+            events = fragmentation_events([r.width for r in heap_blocks], num_start_mallocs, 50, min_block_size)
+        for event in events:
+            if event[0] == "free":
+                self.play(FadeOut(heap_blocks[event[1]]),
                           run_time=runtime)
-                filled_blocks.remove(idx)
-                free_blocks.append(idx)
-            else:
-                if random.random() < 0.4 and len(free_blocks) > 0:  # use freed
-                    idx = random.choice(free_blocks)
-                    r = heap_blocks[idx]
-                    new_width = random.random() * (r.width - min_block_size) + min_block_size
-                    self.play(FadeIn(r.become(
-                        Rectangle(width=new_width, height=r.height, fill_opacity=0.5, color=random_color()).move_to(
-                            r.get_center() + LEFT * r.width / 2 + RIGHT * new_width / 2))),
-                         run_time=runtime)
-                    filled_blocks.append(idx)
-                    free_blocks.remove(idx)
-
-                else:
-                    if len(filled_blocks) > 0:  # new space
-                        idx = max(filled_blocks) + 1
-                        if idx < len(heap_blocks):
-                            r = heap_blocks[idx]
-                            self.play(FadeIn(r.become(
-                                Rectangle(width=r.width, height=r.height, fill_opacity=0.5,
-                                          color=random_color()).move_to(r.get_center()))),
-                                 run_time=runtime)
-                            filled_blocks.append(idx)
+            elif event[0] == "reuse":
+                _, idx, new_width = event
+                r = heap_blocks[idx]
+                self.play(FadeIn(r.become(
+                    Rectangle(width=new_width, height=r.height, fill_opacity=0.5, color=random_color()).move_to(
+                        r.get_center() + LEFT * r.width / 2 + RIGHT * new_width / 2))),
+                     run_time=runtime)
+            else:  # new space
+                r = heap_blocks[event[1]]
+                self.play(FadeIn(r.become(
+                    Rectangle(width=r.width, height=r.height, fill_opacity=0.5,
+                              color=random_color()).move_to(r.get_center()))),
+                     run_time=runtime)
 
         self.pause()
         obj_fade_out = self.mobjects.copy()
@@ -198,11 +198,36 @@ class HeapFragmentationProblem(Slide):
         self.play(FadeOut(reasons))
 
 
-class Allocator(Slide):
-    title = Title("The fixed sized Allocator")
-    main = Text("But we can still do better!")
+def free_list(allocator_text, free_blocks, scale, spacing):
+    popup_list = Rectangle(width=allocator_text.width, height=3).scale(scale).move_to(
+        allocator_text.get_center()).shift(DOWN * 2.3 * scale)
+    popup_caption = Text("free_list<MyObj>").scale(0.3).next_to(popup_list, UL)
+    popup_caption.shift(RIGHT * popup_caption.width + 0.2 + spacing).shift(DOWN * popup_caption.height * 2.5)
+    list_texts = []
+    for idx, block in enumerate(free_blocks):
+        list_texts.append(Text("[" + str(idx) + "]: " + str(block)).scale(0.3))
+        list_texts.append(Line(LEFT, RIGHT).scale_to_fit_width(popup_list.width))
+    if len(list_texts) > 0:
+        list_texts[0].next_to(popup_list, UP).shift(DOWN * list_texts[0].height + DOWN * spacing * 3)
+        for idx, txt in enumerate(list_texts):
+            if idx > 0:
+                txt.next_to(list_texts[idx - 1], DOWN)
+    return VGroup(popup_list, popup_caption, *list_texts)
+
+
+def heap_block_in_state(block, color, fill_opacity):
+    return Rectangle(width=block.width, height=block.height, fill_opacity=fill_opacity, color=color).move_to(
+        block.get_center())
+
+
+class Allocator(DeckSlide):
+    title = LazyMobject(lambda: Title("The fixed sized Allocator"))
+    main = LazyMobject(lambda: Text("But we can still do better!"))
 
     def construct(self):
+        from HeapEvents import allocator_events, trace_allocator_events
+        from HeapTrace import downsample
+
         self.title = HeapFragmentationProblem.title
         self.add(self.title)
         self.play(self.title.animate.become(Title("The fixed sized block allocator")))
@@ -330,47 +355,25 @@ class Allocator(Slide):
         free_blocks = []
 
         popuplist_scale = ValueTracker(0.01)
+        self.checkpoints.track(popuplist_scale)
 
-        def free_list():
-            popup_list = Rectangle(width=allocator_text.width, height=3).scale(popuplist_scale.get_value()).move_to(
-                allocator_text.get_center()).shift(DOWN * 2.3 * popuplist_scale.get_value())
-            popup_caption = Text("free_list<MyObj>").scale(0.3).next_to(popup_list, UL)
-            popup_caption.shift(RIGHT * popup_caption.width + 0.2 + spacing).shift(DOWN * popup_caption.height * 2.5)
-            list_texts = []
-            for idx, block in enumerate(free_blocks):
-                list_texts.append(Text("[" + str(idx) + "]: " + str(block)).scale(0.3))
-                list_texts.append(Line(LEFT, RIGHT).scale_to_fit_width(popup_list.width))
-            if len(list_texts) > 0:
-                list_texts[0].next_to(popup_list, UP).shift(DOWN * list_texts[0].height + DOWN * spacing * 3)
-                for idx, txt in enumerate(list_texts):
-                    if idx > 0:
-                        txt.next_to(list_texts[idx - 1], DOWN)
-            return VGroup(popup_list, popup_caption, *list_texts)
-
-        free_list_obj = always_redraw(free_list)
+        free_list_obj = always_redraw(
+            lambda: free_list(allocator_text, free_blocks, popuplist_scale.get_value(), spacing))
         self.add(free_list_obj)
         self.play(popuplist_scale.animate.set_value(1))
         self.pause()
         random.seed(42)
-        for i in range(20):
-            if random.random() < 0.3 and len(filled_blocks) > 0:  # free
-                idx = random.choice(filled_blocks)
-                r = heap_blocks[idx]
-                self.play(
-                    r.animate.become(Rectangle(width=r.width, height=r.height, fill_opacity=0, color=WHITE).move_to(
-                        r.get_center())),  run_time=runtime)
-                filled_blocks.remove(idx)
-                free_blocks.append(idx)
+        if self.heap_trace:
+            events = trace_allocator_events(downsample(self.heap_trace, 20 + len(filled_blocks)), filled_blocks,
+                                            free_blocks)
+        else:
+            events = allocator_events(filled_blocks, free_blocks, 20)
+        for event, idx in events:
+            r = heap_blocks[idx]
+            if event == "free":
+                self.play(r.animate.become(heap_block_in_state(r, WHITE, 0)), run_time=runtime)
             else:
-                if len(free_blocks) > 0:
-                    idx = free_blocks[-1]
-                    r = heap_blocks[idx]
-                    self.play(r.animate.become(
-                        Rectangle(width=r.width, height=r.height, fill_opacity=0.5, color=GREEN_C).move_to(
-                            r.get_center())),
-                         run_time=runtime)
-                    filled_blocks.append(idx)
-                    free_blocks.remove(idx)
+                self.play(r.animate.become(heap_block_in_state(r, GREEN_C, 0.5)), run_time=runtime)
         self.pause()
         ### intermediate Cleanup
         obj_to_remove = self.mobjects.copy()
@@ -379,9 +382,9 @@ class Allocator(Slide):
         self.wait(3)
 
 
-class AllocatorProblem(Slide):
-    last_title = Title("How can we share this memory?")
-    title = Title("The Allocator Problem")
+class AllocatorProblem(DeckSlide):
+    last_title = LazyMobject(lambda: Title("How can we share this memory?"))
+    title = LazyMobject(lambda: Title("The Allocator Problem"))
 
     def construct(self):
         self.add(Allocator.title, Allocator.main)
@@ -476,8 +479,8 @@ class AllocatorProblem(Slide):
         self.wait()
 
 
-class XAllocator(Slide):
-    title = Title("And how can we use it now?")
+class XAllocator(DeckSlide):
+    title = LazyMobject(lambda: Title("And how can we use it now?"))
 
     def construct(self):
         self.title = AllocatorProblem.last_title
@@ -545,17 +548,12 @@ class XAllocator(Slide):
         self.pause()
         self.play(reimpl_group.animate.become(heap_config_group))
 
-        qr = qrcode.QRCode(image_factory=qrcode.image.svg.SvgPathImage)
-        qr.add_data('https://www.codeproject.com/Articles/1084801/Replace-malloc-free-with-a-fast-fixed-block-memory')
-        qrCodeBlog = qr.make_image(fill_color="white", back_color="black")
-        qrCodeBlog.save("media/images/blogqrcode.svg")
-        qr_code_mobj = SVGMobject(file_name="media/images/blogqrcode.svg", fill_opacity=1, color=WHITE).next_to(
+        qr_code_mobj = qr_code_mobject(
+            'https://www.codeproject.com/Articles/1084801/Replace-malloc-free-with-a-fast-fixed-block-memory').next_to(
             heap_config_group, DR)
         qr_code_mobj.shift(LEFT * qr_code_mobj.width)
         more_details = Text("For more details:").scale(0.5).next_to(qr_code_mobj, LEFT)
-        background_rect = Rectangle(width=qr_code_mobj.width, height=qr_code_mobj.height, color=WHITE,
-                                    fill_opacity=1).move_to(qr_code_mobj.get_center())
-        qr_code_group = VGroup(background_rect, qr_code_mobj, more_details)
+        qr_code_group = VGroup(qr_code_mobj, more_details)
         self.play(FadeIn(qr_code_group))
         self.wait()
         self.pause()
@@ -724,8 +722,8 @@ class XAllocator(Slide):
         self.play(textgroup.animate.become(Title(string_question)), FadeOut(self.title))
 
 
-class STLAllocator(Slide):
-    title = Title(r"And how can we use it now?")
+class STLAllocator(DeckSlide):
+    title = LazyMobject(lambda: Title(r"And how can we use it now?"))
 
     def construct(self):
         self.title = XAllocator.title
@@ -767,32 +765,50 @@ class STLAllocator(Slide):
         self.wait(2)
 
 
-class TimingComparison(Slide):
+class TimingComparison(DeckSlide):
+    # Show the rows estimated by the container models instead of the measured ones, followed by
+    # the cache hit rates behind them. Off by default: the models take seconds to run.
+    model_timings = bool(os.environ.get("DECK_MODEL_TIMINGS"))
+
     def construct(self):
+        from colour import Color
+        from ContainerModels import TIMING_CACHE, cache_report, timing_changes, timing_rows
+        from HeapView import cache_panel
+
         title = STLAllocator.title
         self.add(title)
-        self.play(title.animate.become(Title("Time improvements")))
-
-        time_table = Table([["std::list  ", "Global Heap", "1", "7.28 ms"],
-                            ["std::list  ", "Global Heap", "2", "5.36 ms"],
-                            ["std::list  ", "Global Heap", "3", "4.80 ms"],
-                            ["xlist      ", "Fixed Block", "1", "8.69 ms"],
-                            ["xlist      ", "Fixed Block", "2", "3.03 ms"],
-                            ["xlist      ", "Fixed Block", "3", "2.93 ms"],
-                            ["std::map   ", "Global Heap", "1", "44.9 ms"],
-                            ["std::map   ", "Global Heap", "2", "45.3 ms"],
-                            ["std::map   ", "Global Heap", "3", "40.6 ms"],
-                            ["xmap       ", "Fixed Block", "1", "47.0 ms"],
-                            ["xmap       ", "Fixed Block", "2", "39.2 ms"],
-                            ["xmap       ", "Fixed Block", "3", "38.5 ms"],
-                            ["std::string", "Global Heap", "1", "40.5 ms"],
-                            ["std::string", "Global Heap", "2", "43.4 ms"],
-                            ["std::string", "Global Heap", "3", "44.6 ms"],
-                            ["xstring    ", "Fixed Block", "1", "39.2 ms"],
-                            ["xstring    ", "Fixed Block", "2", "21.1 ms"],
-                            ["xstring    ", "Fixed Block", "3", "19.8 ms"]],
+        caption, column = "Time improvements", "Benchmark Time (ms)"
+        if self.model_timings:
+            # Estimated, not measured: the model gets the pattern of the benchmark, not its values
+            caption, column = "Estimated time improvements", "Model estimate (ms)"
+        self.play(title.animate.become(Title(caption)))
+
+        rows = [["std::list  ", "Global Heap", "1", "7.28 ms"],
+                ["std::list  ", "Global Heap", "2", "5.36 ms"],
+                ["std::list  ", "Global Heap", "3", "4.80 ms"],
+                ["xlist      ", "Fixed Block", "1", "8.69 ms"],
+                ["xlist      ", "Fixed Block", "2", "3.03 ms"],
+                ["xlist      ", "Fixed Block", "3", "2.93 ms"],
+                ["std::map   ", "Global Heap", "1", "44.9 ms"],
+                ["std::map   ", "Global Heap", "2", "45.3 ms"],
+                ["std::map   ", "Global Heap", "3", "40.6 ms"],
+                ["xmap       ", "Fixed Block", "1", "47.0 ms"],
+                ["xmap       ", "Fixed Block", "2", "39.2 ms"],
+                ["xmap       ", "Fixed Block", "3", "38.5 ms"],
+                ["std::string", "Global Heap", "1", "40.5 ms"],
+                ["std::string", "Global Heap", "2", "43.4 ms"],
+                ["std::string", "Global Heap", "3", "44.6 ms"],
+                ["xstring    ", "Fixed Block", "1", "39.2 ms"],
+                ["xstring    ", "Fixed Block", "2", "21.1 ms"],
+                ["xstring    ", "Fixed Block", "3", "19.8 ms"]]
+        changes = {"list": "-41%", "map": "-9.5%", "string": "-53%"}
+        if self.model_timings:
+            rows = timing_rows()
+            changes = timing_changes(rows)
+
+        time_table = Table(rows,
                            col_labels=[Text("Container"), Text("Mode"), Text("Run"),
-                                       Text("Benchmark Time (ms)")]).scale(4 / 18).shift(DOWN * 0.4)
+                                       Text(column)]).scale(4 / 18).shift(DOWN * 0.4)
         switch = False
         c = Color(hue=0, saturation=0.0, luminance=0.6)
         for i in range(len(time_table.get_rows())):
@@ -811,7 +827,7 @@ class TimingComparison(Slide):
 
         list_cells = VGroup(time_table.get_cell((2, 4)), time_table.get_cell((7, 4)))
         brace_list = Brace(list_cells, direction=RIGHT)
-        list_text = Text("list : -41%", t2c={"-41%": GREEN}).next_to(brace_list, RIGHT)
+        list_text = Text(f"list : {changes['list']}", t2c={changes["list"]: GREEN}).next_to(brace_list, RIGHT)
         sur_rects = []
         sur_rects.append(
             SurroundingRectangle(VGroup(time_table.get_cell((3, 4)), time_table.get_cell((4, 4))), color=RED, buff=0))
@@ -828,16 +844,23 @@ class TimingComparison(Slide):
 
         map_cells = VGroup(time_table.get_cell((14, 4)), time_table.get_cell((19, 4)))
         brace_map = Brace(map_cells, direction=RIGHT)
-        map_text = Text("string : -53%", t2c={"-53%": GREEN}).next_to(brace_map, RIGHT)
+        map_text = Text(f"string : {changes['string']}", t2c={changes["string"]: GREEN}).next_to(brace_map, RIGHT)
 
         string_cells = VGroup(time_table.get_cell((8, 4)), time_table.get_cell((13, 4)))
         brace_string = Brace(string_cells, direction=RIGHT)
-        string_text = Text("map : -9.5%", t2c={"-9.5%": GREEN}).next_to(brace_string, RIGHT)
+        string_text = Text(f"map : {changes['map']}", t2c={changes["map"]: GREEN}).next_to(brace_string, RIGHT)
 
-        self.play(*[Create(obj) for obj in
-                    [brace_string, brace_list, brace_map, map_text, string_text, list_text, *sur_rects]])
+        braces = [brace_string, brace_list, brace_map, map_text, string_text, list_text, *sur_rects]
+        self.play(*[Create(obj) for obj in braces])
         self.wait(frozen_frame=False)
         self.pause()
+
+        if self.model_timings:
+            # Why: the containers' address streams replayed through a cache model
+            panel = cache_panel(cache_report(**TIMING_CACHE)).scale(0.3).next_to(time_table, RIGHT)
+            self.play(*[FadeOut(obj) for obj in braces], FadeIn(panel))
+            self.wait(frozen_frame=False)
+            self.pause()
         all_objects_without_caption = self.mobjects.copy()
         all_objects_without_caption.remove(title)
         self.play(*[FadeOut(t) for t in all_objects_without_caption])
@@ -845,8 +868,10 @@ class TimingComparison(Slide):
         self.wait(frozen_frame=False)
 
 
-class Conclusion(Slide):
+class Conclusion(DeckSlide):
     def construct(self):
+        from Updaters import add_dependent_updater
+
         self.add(Title(r"Pros \& Cons"))
         pros = Text("Pros", color=GREEN).shift(UP * 2)
         pros_bullet = BulletedList("Reuse of containers",
@@ -854,7 +879,7 @@ class Conclusion(Slide):
                                    "Faster execution time",
                                    "No memory fragmentation")
         pros_bullet.next_to(pros, DOWN)
-        pros_bullet.add_updater(lambda d: d.next_to(pros, DOWN))
+        add_dependent_updater(pros_bullet, lambda d: d.next_to(pros, DOWN), pros)
         self.play(Write(pros), FadeIn(pros_bullet))
         self.pause()
         self.play(pros.animate.shift(LEFT * 3))
@@ -863,8 +888,174 @@ class Conclusion(Slide):
                                     "Not suited for vector",
                                     r"Not suited for different\\ sized objects", fill_opacity=1)
         cons_bullets.next_to(cons, DOWN)
-        cons_bullets.add_updater(lambda d: d.next_to(cons, DOWN))
+        add_dependent_updater(cons_bullets, lambda d: d.next_to(cons, DOWN), cons)
         cons.shift(RIGHT * 3.5)
         self.play(Write(cons), Write(cons_bullets))
         self.pause()
         self.wait()
+
+
+class BuddyComparison(DeckSlide):
+    def construct(self):
+        from AllocatorModels import BuddyAllocator, FixedBlockPools, replay, replay_steps
+        from HeapTrace import downsample, synthetic_trace
+        from HeapView import heap_row_blocks, pool_rows, stats_overlay
+
+        title = Title("Different sized objects: Buddy allocation")
+        self.add(title)
+
+        heap_width = 10.3
+        heap_height = 2.6
+        spacing = 0.15
+        displayed_rows = 5
+        min_block_width = 0.6
+        # Narrower than on the XAllocator slide to leave room for the stats, same pools though
+        pools_heap = Rectangle(width=7.5, height=heap_height).shift(UP * 0.9 + LEFT * 1.6)
+        buddy_heap = Rectangle(width=7.5, height=heap_height).shift(DOWN * 2.2 + LEFT * 1.6)
+        pools_text = Text("XAllocator").scale(0.4).next_to(pools_heap, UP, buff=0.1, aligned_edge=LEFT)
+        buddy_text = Text("Buddy").scale(0.4).next_to(buddy_heap, UP, buff=0.1, aligned_edge=LEFT)
+
+        # Same rows as the XAllocator slide; the buddy heap gets one 128 byte top level block per row
+        pools = FixedBlockPools([8 << j for j in range(displayed_rows)],
+                                pool_rows(heap_width, spacing, min_block_width, displayed_rows))
+        buddy = BuddyAllocator(-(-pools.total_size // 128) * 128, 8, 128)
+        pools_blocks = always_redraw(lambda: heap_row_blocks(pools.blocks(), pools_heap, displayed_rows, spacing))
+        buddy_blocks = always_redraw(lambda: heap_row_blocks(buddy.blocks(), buddy_heap, displayed_rows, spacing))
+        pools_stats = stats_overlay(pools.stats, lambda t: t.scale_to_fit_width(4.2).next_to(pools_heap, RIGHT))
+        buddy_stats = stats_overlay(buddy.stats, lambda t: t.scale_to_fit_width(4.2).next_to(buddy_heap, RIGHT))
+        self.play(FadeIn(pools_heap), FadeIn(buddy_heap), Write(pools_text), Write(buddy_text),
+                  FadeIn(pools_blocks), FadeIn(buddy_blocks), FadeIn(pools_stats), FadeIn(buddy_stats))
+        self.pause()
+
+        if self.heap_trace:
+            trace = downsample(self.heap_trace, 60)
+        else:
+            trace = synthetic_trace(60, seed=42, max_size=128)
+        for _ in zip(replay_steps(pools, trace), replay_steps(buddy, trace)):
+            self.wait(0.15, frozen_frame=False)
+        self.pause()
+
+        # The numbers come from a longer run of the same trace source on larger heaps; a dry run
+        # only checks the layout, which does not depend on the trace length
+        events = 1000 if self.dry_run else 20000
+        if self.heap_trace:
+            trace = downsample(self.heap_trace, events)
+        else:
+            trace = synthetic_trace(events, seed=42)
+        large_pools = FixedBlockPools([8 << j for j in range(10)], 64)
+        pools_result = replay(large_pools, trace)
+        buddy_result = replay(BuddyAllocator(large_pools.total_size, 8, 4096), trace)
+        rows = [["Internal fragmentation", "internal_fragmentation", "{:.0%}"],
+                ["External fragmentation", "external_fragmentation", "{:.0%}"],
+                ["Failed allocations", "failed_allocations", "{}"],
+                ["Live allocations", "live_allocations", "{}"]]
+        stats_table = Table([[label, fmt.format(pools_result[key]), fmt.format(buddy_result[key])]
+                             for label, key, fmt in rows],
+                            col_labels=[Text("Statistic"), Text("XAllocator"), Text("Buddy")])
+        stats_table.scale(0.5).shift(DOWN * 0.5)
+        all_objects_without_caption = self.mobjects.copy()
+        all_objects_without_caption.remove(title)
+        self.play(*[FadeOut(t) for t in all_objects_without_caption])
+        self.play(FadeIn(stats_table))
+        self.pause()
+        self.wait()
+
+
+class VectorComparison(DeckSlide):
+    def construct(self):
+        from HeapView import vector_cells, vector_stats_text
+        from VectorModels import DoublingVector, SegmentedVector
+
+        title = Title("Not suited for vector?")
+        self.add(title)
+
+        cell_width = 0.3
+        elements = 24
+        doubling = DoublingVector()
+        segmented = SegmentedVector.with_pool(4 * 8, 8)
+        doubling_text = Text("std::vector").scale(0.5).to_edge(LEFT).shift(UP * 1.8)
+        segmented_text = Text("Segmented vector").scale(0.5).to_edge(LEFT).shift(DOWN * 0.4)
+        directory_text = Text("Directory:").scale(0.4).next_to(segmented_text, DOWN, aligned_edge=LEFT)
+        pool_text = Text("Pool:").scale(0.4).next_to(directory_text, DOWN * 2.5, aligned_edge=LEFT)
+
+        doubling_cells = always_redraw(lambda: vector_cells(len(doubling), doubling.capacity(), cell_width)
+                                       .next_to(doubling_text, DOWN, aligned_edge=LEFT))
+        doubling_stats = always_redraw(lambda: vector_stats_text(doubling).next_to(doubling_text, RIGHT * 4))
+        directory_cells = always_redraw(lambda: vector_cells(segmented.blocks, len(segmented.directory),
+                                                             cell_width, color=GREEN_A).next_to(directory_text, RIGHT))
+
+        def pool_blocks():
+            # Blocks at their pool position, each filled up to the elements it holds
+            blocks = VGroup()
+            for i in range(segmented.pool.blocks_per_pool[0]):
+                if i < segmented.blocks:
+                    used = min(segmented.block_elements, len(segmented) - i * segmented.block_elements)
+                    index = segmented.directory[i] // segmented.block_size
+                else:
+                    used, index = 0, i
+                offset = index * (segmented.block_elements + 0.5) * cell_width
+                blocks.add(vector_cells(used, segmented.block_elements, cell_width, color=GREEN_A)
+                           .next_to(pool_text, RIGHT).shift(RIGHT * offset))
+            return blocks
+
+        segmented_cells = always_redraw(pool_blocks)
+        segmented_stats = always_redraw(lambda: vector_stats_text(segmented).next_to(segmented_text, RIGHT * 4))
+        self.play(Write(doubling_text), Write(segmented_text), Write(directory_text), Write(pool_text),
+                  FadeIn(doubling_cells), FadeIn(doubling_stats), FadeIn(directory_cells), FadeIn(segmented_cells),
+                  FadeIn(segmented_stats))
+        self.pause()
+
+        for value in range(elements):
+            doubling.append(value)
+            segmented.append(value)
+            self.wait(0.2, frozen_frame=False)
+        self.pause()
+
+        mitigation = BulletedList("No reallocation: elements never move",
+                                  "Directory grows, but holds one pointer per block",
+                                  "Indexing: one extra lookup",
+                                  "Not contiguous: no data() for C APIs").scale(0.7).to_edge(DOWN)
+        self.play(FadeIn(mitigation))
+        self.pause()
+        self.wait()
+
+
+class AllocatorContention(DeckSlide):
+    # One owl per worker thread. The owls are an OwlFlock, so the drawing work follows the
+    # handful of distinct poses, not the 32 owls.
+    def construct(self):
+        from OwlFlock import OwlFlock, POSE_FIELDS
+
+        title = Title("Many threads, one heap")
+        self.add(title)
+
+        columns, rows = 8, 4
+        positions = [[(column - (columns - 1) / 2.) * 1.5, 1.6 - row * 1.2, 0]
+                     for row in range(rows) for column in range(columns)]
+        flock = OwlFlock(positions, scale=0.15)
+        wing = POSE_FIELDS.index("right_wing_rotation")
+        look_x = POSE_FIELDS.index("pupil_pos_x")
+        look_y = POSE_FIELDS.index("pupil_pos_y")
+        lock_text = Text("malloc(): one lock for the global heap").scale(0.5).to_edge(DOWN)
+        self.play(FadeIn(flock.mobject), Write(lock_text))
+        self.pause()
+
+        # Every thread waits for the lock and looks at it; only the holder gets to work
+        for holder in random.Random(7).sample(range(len(positions)), 6):
+            poses = np.tile(flock.default_pose(), (len(positions), 1))
+            poses[:, look_y] = -1
+            poses[holder, look_y] = 1
+            poses[holder, wing] = 2.4
+            self.play(flock.animate_poses(poses, run_time=0.6))
+        self.pause()
+
+        # With a pool per thread nobody waits: all owls work at once, in two poses
+        pools_text = Text("xmalloc(): a fixed block pool per thread").scale(0.5).to_edge(DOWN)
+        self.play(lock_text.animate.become(pools_text))
+        for beat in range(4):
+            poses = np.tile(flock.default_pose(), (len(positions), 1))
+            poses[:, wing] = np.where(np.arange(len(positions)) % 2 == beat % 2, 3., 2.)
+            poses[:, look_x] = 0.5 if beat % 2 else -0.5
+            self.play(flock.animate_poses(poses, run_time=0.4))
+        self.pause()
+        self.wait()
@@ -0,0 +1,154 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from CacheSim import check_lockstep
+from ContainerModels import (WORKLOADS, NodePool, XList, XMap, cache_report, estimated_cycles, run_workload,
+                             timing_rows, workload_pool)
+from VectorModels import DoublingVector, SegmentedVector
+
+# Benchmarks of the container models. Times are for the Python models and only compare them
+# with each other; the byte counts are what the C++ containers would do as well.
+
+VECTOR_SIZES = (1000, 10000, 100000)
+VECTOR_BLOCK_SIZE = 512
+CONTAINER_SIZE = 10000
+PLACEMENTS = ("pool", "scattered")
+
+
+def vector_models(size):
+    blocks = -(-size * 8 // VECTOR_BLOCK_SIZE)
+    return {
+        "doubling": DoublingVector(),
+        "segmented": SegmentedVector.with_pool(VECTOR_BLOCK_SIZE, blocks),
+    }
+
+
+def vector_benchmark(vector, size, lookups=10000, seed=0):
+    start = time.perf_counter()
+    for value in range(size):
+        vector.append(value)
+    append_seconds = time.perf_counter() - start
+    indices = np.random.default_rng(seed).integers(size, size=lookups).tolist()
+    start = time.perf_counter()
+    for index in indices:
+        vector[index]
+    lookup_seconds = time.perf_counter() - start
+    result = vector.stats()
+    result.update(append_ns=append_seconds / size * 1e9, lookup_ns=lookup_seconds / lookups * 1e9)
+    return result
+
+
+def vector_benchmarks(sizes=VECTOR_SIZES):
+    return {f"vector[{name},{size}]": vector_benchmark(vector, size)
+            for size in sizes for name, vector in vector_models(size).items()}
+
+
+def print_vector_results(results):
+    print(f"{'case':<28} {'append':>10} {'lookup':>10} {'copied':>12} {'peak':>12} {'slack':>10}")
+    for name, result in results.items():
+        print(f"{name:<28} {result['append_ns']:8.0f}ns {result['lookup_ns']:8.0f}ns "
+              f"{result['copy_bytes']:12d} {result['peak_bytes']:12d} {result['slack_bytes']:10d}")
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def container_benchmark(name, placement, size=CONTAINER_SIZE, seed=0):
+    # Operations per second of each phase, plus the cost model's cycles for the phase's accesses
+    rng = np.random.default_rng(seed)
+    keys = rng.permutation(size).tolist()
+    if name == "list":
+        # find() walks from the head, so the sampled keys have to be spread over the whole list
+        lookup_keys = rng.choice(size, size // 100, replace=False).tolist()
+        pool = NodePool(size, XList.FIELDS, 24, placement, seed)
+        container = XList(pool)
+        phases = {"insert": lambda: [container.push_back(key) for key in keys],
+                  "lookup": lambda: [container.find(key) for key in lookup_keys],
+                  "iterate": lambda: sum(container)}
+        lookups = size // 100
+    else:
+        pool = NodePool(size, XMap.FIELDS, 48, placement, seed)
+        container = XMap(pool)
+        phases = {"insert": lambda: [container.insert(key, key) for key in keys],
+                  "lookup": lambda: [container.get(key) for key in keys],
+                  "iterate": lambda: sum(value for _, value in container.items())}
+        lookups = size
+    result = {}
+    for phase, function in phases.items():
+        pool.reset_trace()
+        seconds = timed(function)
+        operations = lookups if phase == "lookup" else size
+        result[f"{phase}_per_second"] = operations / seconds
+        result[f"{phase}_cycles"] = estimated_cycles(pool)
+    return result
+
+
+def cache_check_streams(seed=0):
+    # Uniform, page strided (all in a few sets) and hot addresses, then every workload's stream
+    rng = np.random.default_rng(seed)
+    streams = [rng.integers(1 << 22, size=20000), np.arange(20000) % 300 * 4096,
+               rng.integers(64 * 64 * 8 * 2, size=20000)]
+    for workload in WORKLOADS:
+        for placement in PLACEMENTS:
+            pool = workload_pool(workload, placement)
+            run_workload(workload, pool, seed)
+            streams.append(pool.address_stream())
+    return streams
+
+
+def container_benchmarks():
+    return {f"{name}[{placement}]": container_benchmark(name, placement)
+            for name in ("list", "map") for placement in PLACEMENTS}
+
+
+def print_container_results(results):
+    print(f"{'case':<20} {'insert/s':>10} {'lookup/s':>10} {'iterate/s':>10} "
+          f"{'insert cyc':>12} {'lookup cyc':>12} {'iterate cyc':>12}")
+    for name, result in results.items():
+        print(f"{name:<20} {result['insert_per_second']:10.0f} {result['lookup_per_second']:10.0f} "
+              f"{result['iterate_per_second']:10.0f} {result['insert_cycles']:12d} {result['lookup_cycles']:12d} "
+              f"{result['iterate_cycles']:12d}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the container models")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--timing-rows", action="store_true",
+                        help="print the TimingComparison rows estimated from the models")
+    parser.add_argument("--check-cache", action="store_true",
+                        help="check the cache simulator against its access by access version and exit")
+    parser.add_argument("--cache", nargs=3, type=int, metavar=("LINE_SIZE", "SETS", "WAYS"),
+                        help="print the hit rates of the container workloads in this cache")
+    args = parser.parse_args()
+
+    if args.check_cache:
+        streams = cache_check_streams()
+        mismatches = sum(check_lockstep(streams, *config) for config in ((64, 64, 8), (64, 512, 8), (32, 1, 4)))
+        if mismatches:
+            raise SystemExit(f"cache simulator: {mismatches} accesses differ from the access by access run")
+        print("cache simulator matches the access by access run")
+        raise SystemExit
+    results = vector_benchmarks()
+    print_vector_results(results)
+    print()
+    containers = container_benchmarks()
+    print_container_results(containers)
+    results.update(containers)
+    if args.timing_rows:
+        print()
+        for row in timing_rows():
+            print("  ".join(row))
+    if args.cache:
+        print()
+        for workload, placements in cache_report(*args.cache)["workloads"].items():
+            for placement, result in placements.items():
+                print(f"{workload:<8} {placement:<10} {result['hit_rate']:6.1%} {result['cycles']:12d} cycles")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,117 @@
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+# Deck order. Listing the deck needs no import at all; a slide's module is only imported when
+# the slide itself is requested. All slides stay in main.py: they hand their titles on to the
+# next slide (XAllocator starts from AllocatorProblem.last_title and so on), so splitting them
+# would only turn those references into imports between the new modules. main.py imports each
+# slide's models in its construct() instead. check_registry() keeps this list in sync with the
+# DeckSlide subclasses.
+SLIDES = [
+    ("Welcome", "main"),
+    ("Intro", "main"),
+    ("HeapFragmentationProblem", "main"),
+    ("Allocator", "main"),
+    ("AllocatorProblem", "main"),
+    ("XAllocator", "main"),
+    ("STLAllocator", "main"),
+    ("TimingComparison", "main"),
+    ("Conclusion", "main"),
+    ("BuddyComparison", "main"),
+    ("VectorComparison", "main"),
+    ("AllocatorContention", "main"),
+]
+
+# Measured import times, recorded with --record-import-budget; a module may take this much longer
+IMPORT_BASELINE_FILE = "import_baseline.json"
+IMPORT_MODULES = ("slides", "main")
+IMPORT_MARGIN = 1.5
+
+
+def slide_names():
+    return [name for name, _ in SLIDES]
+
+
+def load_slide(name):
+    module = importlib.import_module(dict(SLIDES)[name])
+    return getattr(module, name)
+
+
+def measure_import_time(module, repeat=3):
+    # Fresh interpreters, so nothing is already cached in sys.modules
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return min(float(subprocess.check_output([sys.executable, "-c", code])) for _ in range(repeat))
+
+
+def load_import_baseline():
+    if not os.path.exists(IMPORT_BASELINE_FILE):
+        return {}
+    with open(IMPORT_BASELINE_FILE) as f:
+        return json.load(f)
+
+
+def record_import_baseline():
+    baseline = {module: measure_import_time(module) for module in IMPORT_MODULES}
+    with open(IMPORT_BASELINE_FILE, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    return baseline
+
+
+def check_import_budget():
+    baseline = load_import_baseline()
+    over_budget = []
+    for module in IMPORT_MODULES:
+        seconds = measure_import_time(module)
+        if module not in baseline:
+            print(f"{module:<10} {seconds:6.3f}s  no baseline, record one with --record-import-budget")
+            over_budget.append(module)
+            continue
+        budget = baseline[module] * IMPORT_MARGIN
+        print(f"{module:<10} {seconds:6.3f}s  budget {budget:6.3f}s")
+        if seconds > budget:
+            over_budget.append(module)
+    return over_budget
+
+
+def check_registry():
+    # Slides missing from SLIDES and entries that are no DeckSlide subclass of their module
+    from DeckSlide import DeckSlide
+
+    defined = set()
+    for module_name in set(dict(SLIDES).values()):
+        module = importlib.import_module(module_name)
+        defined |= {(name, module_name) for name, value in vars(module).items()
+                    if isinstance(value, type) and issubclass(value, DeckSlide) and value is not DeckSlide
+                    and value.__module__ == module_name}
+    registered = set(SLIDES)
+    return sorted(defined - registered), sorted(registered - defined)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the deck or check its import time budget")
+    parser.add_argument("--import-budget", action="store_true")
+    parser.add_argument("--record-import-budget", action="store_true", help="measure and store the baseline")
+    parser.add_argument("--check-registry", action="store_true", help="compare SLIDES with the DeckSlide classes")
+    args = parser.parse_args()
+
+    if args.record_import_budget:
+        for module, seconds in record_import_baseline().items():
+            print(f"{module:<10} {seconds:6.3f}s")
+    elif args.check_registry:
+        unregistered, unknown = check_registry()
+        for name, module in unregistered:
+            print(f"not in SLIDES: {module}.{name}")
+        for name, module in unknown:
+            print(f"no such slide: {module}.{name}")
+        if unregistered or unknown:
+            raise SystemExit("SLIDES is out of sync with the slide classes")
+    elif args.import_budget:
+        over_budget = check_import_budget()
+        if over_budget:
+            raise SystemExit(f"over import time budget: {', '.join(over_budget)}")
+    else:
+        print("\n".join(slide_names()))